@@ -1,28 +1,65 @@
 import os
+from typing import Optional
+
 from flask import Flask, render_template
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def create_app():
+def create_app(debug: Optional[bool] = None):
     app = Flask(__name__, static_folder='static', template_folder='templates')
+    # Debug (and so the reloader) must be known here, not only at run() time, for the scheduler guard below.
+    if debug is not None:
+        app.debug = debug
     app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET', 'dev')
     app.config['DATA_DIR'] = os.getenv('DATA_DIR', './data')
     app.config['UPLOAD_DIR'] = os.getenv('UPLOAD_DIR', './uploads')
+    app.config['MARKET_DATA_PROVIDER'] = os.getenv('MARKET_DATA_PROVIDER', 'live')
+    app.config['FIXTURE_DIR'] = os.getenv('FIXTURE_DIR', './fixtures')
+    app.config['PROVIDER_LATENCY_MS'] = float(os.getenv('PROVIDER_LATENCY_MS', '0'))
+    app.config['PROVIDER_JITTER_MS'] = float(os.getenv('PROVIDER_JITTER_MS', '0'))
+    app.config['PROVIDER_ERROR_RATE'] = float(os.getenv('PROVIDER_ERROR_RATE', '0'))
+    app.config['ONEPAGER_COMPS_TIMEOUT'] = float(os.getenv('ONEPAGER_COMPS_TIMEOUT', '10'))
+    app.config['WATCHLIST'] = os.getenv('WATCHLIST', '')
+    app.config['REFRESH_ENABLED'] = os.getenv('REFRESH_ENABLED', '0').lower() in ('1', 'true', 'yes')
+    app.config['REFRESH_INTERVAL_S'] = float(os.getenv('REFRESH_INTERVAL_S', '86400'))
+    app.config['REFRESH_JITTER_S'] = float(os.getenv('REFRESH_JITTER_S', '900'))
+    app.config['REFRESH_WINDOW'] = os.getenv('REFRESH_WINDOW', '01-06')
+    app.config['REFRESH_CONCURRENCY'] = int(os.getenv('REFRESH_CONCURRENCY', '2'))
 
     os.makedirs(app.config['DATA_DIR'], exist_ok=True)
     os.makedirs(app.config['UPLOAD_DIR'], exist_ok=True)
 
+    from services.providers import configure_providers
+    configure_providers(app.config)
+
+    from services.scheduler import RefreshScheduler, parse_window
+    scheduler = RefreshScheduler(
+        app.config['DATA_DIR'],
+        watchlist=[t for t in app.config['WATCHLIST'].split(',') if t.strip()],
+        interval=app.config['REFRESH_INTERVAL_S'],
+        jitter=app.config['REFRESH_JITTER_S'],
+        window=parse_window(app.config['REFRESH_WINDOW']),
+        max_concurrency=app.config['REFRESH_CONCURRENCY'],
+    )
+    app.extensions['refresh_scheduler'] = scheduler
+    # Under the debug reloader the parent process only watches files; only the child that serves
+    # requests (WERKZEUG_RUN_MAIN) should run the scheduler.
+    if app.config['REFRESH_ENABLED'] and (not app.debug or os.getenv('WERKZEUG_RUN_MAIN') == 'true'):
+        scheduler.start()
+
     from routes.data_routes import bp as data_bp
     from routes.statements_routes import bp as statements_bp
     from routes.analysis_routes import bp as analysis_bp
     from routes.valuation_routes import bp as valuation_bp
+    from routes.onepager_routes import bp as onepager_bp
     from routes.sports_routes import bp as sports_bp
 
     app.register_blueprint(data_bp, url_prefix='/data')
     app.register_blueprint(statements_bp, url_prefix='/statements')
     app.register_blueprint(analysis_bp, url_prefix='/analysis')
     app.register_blueprint(valuation_bp, url_prefix='/valuation')
+    app.register_blueprint(onepager_bp, url_prefix='/onepager')
     app.register_blueprint(sports_bp, url_prefix='/sports')
 
     @app.route('/')
@@ -33,4 +70,4 @@ def create_app():
 
 
 if __name__ == '__main__':
-    create_app().run(debug=True)
+    create_app(debug=True).run()
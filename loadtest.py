@@ -0,0 +1,206 @@
+"""Load-test driver for the finance app.
+
+Drives fetch -> statements -> analysis -> valuation -> export flows at a given
+concurrency, either in-process against ``create_app()`` (default) or over HTTP
+against a running server (``--base-url``), and reports throughput and
+p50/p95/p99 latency per route.
+
+Examples::
+
+    python loadtest.py synth AAPL MSFT GOOG --fixtures ./fixtures
+    python loadtest.py record AAPL MSFT --fixtures ./fixtures
+    python loadtest.py run --tickers AAPL,MSFT,GOOG --concurrency 8 --iterations 50 \\
+        --fixtures ./fixtures --latency-ms 40 --error-rate 0.02
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from services.providers import ApiFootballProvider, RecordingProvider, YahooProvider, write_synthetic_fixtures
+
+
+def record_fixtures(fixture_dir: str, tickers) -> None:
+    """Pull each ticker from Yahoo once and save the responses as replayable fixtures."""
+    recorder = RecordingProvider(fixture_dir, YahooProvider(), ApiFootballProvider())
+    for tk in tickers:
+        recorder.history(tk)
+        recorder.statements(tk)
+        recorder.quote(tk)
+
+
+class _InProcessClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, params=None, body=None):
+        resp = self.client.open(path, method=method, query_string=params, json=body)
+        payload = resp.get_json(silent=True) if resp.is_json else None
+        return resp.status_code, payload
+
+
+class _HttpClient:
+    def __init__(self, base_url):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, params=None, body=None):
+        resp = self.session.request(method, self.base_url + path, params=params, json=body, timeout=60)
+        try:
+            payload = resp.json()
+        except ValueError:
+            payload = None
+        return resp.status_code, payload
+
+
+def _percentiles(values):
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None}
+    p50, p95, p99 = np.percentile(np.asarray(values) * 1000.0, [50, 95, 99])
+    return {'p50': round(float(p50), 2), 'p95': round(float(p95), 2), 'p99': round(float(p99), 2)}
+
+
+def run_load_test(tickers, concurrency: int = 4, iterations: int = 20, app=None, base_url: str = None, peers: int = 3):
+    """Run ``iterations`` end-to-end flows across ``concurrency`` workers.
+
+    Returns ``{'elapsed_s', 'flows', 'routes': {route: {count, errors, throughput_rps, p50, p95, p99}}}``
+    with latencies in milliseconds.
+    """
+    if app is None and base_url is None:
+        raise ValueError('app or base_url required')
+    tickers = [t.upper() for t in tickers]
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = _HttpClient(base_url) if base_url else _InProcessClient(app)
+        return local.client
+
+    def call(route, method, path, params=None, body=None):
+        t0 = time.perf_counter()
+        try:
+            status, payload = client().request(method, path, params=params, body=body)
+        except Exception:
+            status, payload = 599, None
+        elapsed = time.perf_counter() - t0
+        with lock:
+            samples[route].append(elapsed)
+            if status >= 400:
+                errors[route] += 1
+        return status, payload
+
+    def flow(i):
+        ticker = tickers[i % len(tickers)]
+        status, payload = call('POST /data/fetch', 'POST', '/data/fetch', body={'ticker': ticker})
+        if status >= 400 or not payload:
+            return
+        folder = payload['folder']
+        call('GET /statements/', 'GET', '/statements/', params={'path': folder})
+        call('GET /analysis/', 'GET', '/analysis/', params={'path': folder})
+        _, dcf = call('POST /valuation/dcf', 'POST', '/valuation/dcf', body={
+            'ticker': ticker, 'wacc': 0.09, 'terminal_growth': 0.025, 'forecast_years': 5,
+        })
+        comp_set = [tickers[(i + k) % len(tickers)] for k in range(min(peers, len(tickers)))]
+        _, comps = call('POST /valuation/comps', 'POST', '/valuation/comps', body={'tickers': comp_set})
+        call('GET /statements/export', 'GET', '/statements/export', params={'path': folder, 'ticker': ticker})
+        call('POST /valuation/export', 'POST', '/valuation/export', body={
+            'ticker': ticker,
+            'dcf': (dcf or {}).get('dcf') or {},
+            'comps': (comps or {}).get('table') or {},
+        })
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(flow, range(iterations)))
+    elapsed = time.perf_counter() - t0
+
+    routes = {}
+    for route, values in samples.items():
+        routes[route] = {
+            'count': len(values),
+            'errors': errors[route],
+            'throughput_rps': round(len(values) / elapsed, 2) if elapsed else None,
+            **_percentiles(values),
+        }
+    return {'elapsed_s': round(elapsed, 3), 'flows': iterations, 'concurrency': concurrency, 'routes': routes}
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['flows']} flows @ concurrency {report['concurrency']} in {report['elapsed_s']}s",
+        f"{'route':<24}{'count':>7}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for route, r in report['routes'].items():
+        lines.append(
+            f"{route:<24}{r['count']:>7}{r['errors']:>8}{r['throughput_rps']:>9}"
+            f"{r['p50']:>10}{r['p95']:>10}{r['p99']:>10}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    synth = sub.add_parser('synth', help='write synthetic fixtures')
+    synth.add_argument('tickers', nargs='+')
+    synth.add_argument('--fixtures', default='./fixtures')
+
+    record = sub.add_parser('record', help='record fixtures from Yahoo Finance')
+    record.add_argument('tickers', nargs='+')
+    record.add_argument('--fixtures', default='./fixtures')
+
+    run = sub.add_parser('run', help='run the load test')
+    run.add_argument('--tickers', required=True, help='comma separated')
+    run.add_argument('--concurrency', type=int, default=4)
+    run.add_argument('--iterations', type=int, default=20)
+    run.add_argument('--base-url', help='hit a running server instead of an in-process app')
+    run.add_argument('--fixtures', default='./fixtures')
+    run.add_argument('--data-dir', help='defaults to a temporary directory')
+    run.add_argument('--latency-ms', type=float, default=0.0)
+    run.add_argument('--jitter-ms', type=float, default=0.0)
+    run.add_argument('--error-rate', type=float, default=0.0)
+    run.add_argument('--json', action='store_true', help='print the raw report as JSON')
+
+    args = parser.parse_args(argv)
+    if args.command == 'synth':
+        for i, tk in enumerate(args.tickers):
+            print(write_synthetic_fixtures(args.fixtures, tk, seed=i))
+        return
+    if args.command == 'record':
+        record_fixtures(args.fixtures, args.tickers)
+        return
+
+    app = None
+    if not args.base_url:
+        os.environ.update({
+            'DATA_DIR': args.data_dir or tempfile.mkdtemp(prefix='loadtest_data_'),
+            'UPLOAD_DIR': tempfile.mkdtemp(prefix='loadtest_uploads_'),
+            'MARKET_DATA_PROVIDER': 'replay',
+            'FIXTURE_DIR': args.fixtures,
+            'PROVIDER_LATENCY_MS': str(args.latency_ms),
+            'PROVIDER_JITTER_MS': str(args.jitter_ms),
+            'PROVIDER_ERROR_RATE': str(args.error_rate),
+        })
+        from app import create_app
+
+        app = create_app()
+
+    tickers = [t.strip() for t in args.tickers.split(',') if t.strip()]
+    report = run_load_test(tickers, args.concurrency, args.iterations, app=app, base_url=args.base_url)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 from flask import Blueprint, request, render_template, current_app
-from services.analysis import compute_ratios, common_size, dupont_breakdown, growth_table
+from services.analysis import analysis_tables
 from services.statements import standardize_statements
 
 bp = Blueprint('analysis', __name__)
@@ -16,17 +16,14 @@ def view():
     if std.error:
         return render_template('analysis.html', error=std.error, ticker=ticker, folder_path=path)
 
-    ratios = compute_ratios(std=std)
-    cs = common_size(std=std)
-    dup = dupont_breakdown(std=std)
-    gr = growth_table(std=std)
+    tables = analysis_tables(std=std)
 
     return render_template(
         'analysis.html',
-        ratios=ratios,
-        common_size=cs,
-        dupont=dup,
-        growth=gr,
+        ratios=tables['ratios'],
+        common_size=tables['common_size'],
+        dupont=tables['dupont'],
+        growth=tables['growth'],
         ticker=ticker,
         folder_path=path,
     )
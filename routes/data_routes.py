@@ -1,9 +1,10 @@
 import os
-import datetime as dt
 from flask import Blueprint, request, jsonify, current_app, send_file
 from werkzeug.utils import secure_filename
-from services.data_fetch import fetch_yf_history, fetch_yf_statements
-from services.utils import ensure_dir
+from services.charts import ChartDataUnavailable, chart_data
+from services.data_fetch import fetch_quote, fetch_yf_history, fetch_yf_statements, save_snapshot
+from services.providers import ProviderError
+from services.utils import ensure_dir, parse_tickers
 
 bp = Blueprint('data', __name__)
 
@@ -19,32 +20,21 @@ def fetch():
     if not ticker:
         return jsonify({'ok': False, 'error': 'ticker required'}), 400
 
-    data_dir = current_app.config['DATA_DIR']
-    date_tag = dt.datetime.now().strftime('%Y%m%d_%H%M%S')
-    save_dir = os.path.join(data_dir, secure_filename(ticker.upper()), date_tag)
-    ensure_dir(save_dir)
-
-    hist = fetch_yf_history(ticker, start=start, end=end, interval=interval)
-    price_path = os.path.join(save_dir, 'price_history.csv')
-    hist.to_csv(price_path)
-
-    is_df, bs_df, cf_df = fetch_yf_statements(ticker)
-    is_path = os.path.join(save_dir, 'income_statement.csv')
-    bs_path = os.path.join(save_dir, 'balance_sheet.csv')
-    cf_path = os.path.join(save_dir, 'cash_flow.csv')
-    is_df.to_csv(is_path, index=False)
-    bs_df.to_csv(bs_path, index=False)
-    cf_df.to_csv(cf_path, index=False)
-
+    try:
+        hist = fetch_yf_history(ticker, start=start, end=end, interval=interval)
+        statements = fetch_yf_statements(ticker)
+    except ProviderError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 502
+    try:
+        quote = fetch_quote(ticker)
+    except ProviderError:
+        quote = None
+
+    save_dir, files, _ = save_snapshot(current_app.config['DATA_DIR'], ticker, hist, statements, quote=quote)
     return jsonify({
         'ok': True,
         'folder': save_dir,
-        'files': {
-            'price_history': price_path,
-            'income_statement': is_path,
-            'balance_sheet': bs_path,
-            'cash_flow': cf_path,
-        },
+        'files': files,
     })
 
 
@@ -102,3 +92,69 @@ def download():
         return send_file(resolved, as_attachment=True)
 
     return jsonify({'ok': False, 'error': 'file not found'}), 404
+
+
+def _inside(path: str, root: str) -> bool:
+    try:
+        return os.path.commonpath([os.path.realpath(path), os.path.realpath(root)]) == os.path.realpath(root)
+    except ValueError:
+        # Occurs on Windows when drives differ.
+        return False
+
+
+@bp.route('/chart', methods=['GET'])
+def chart():
+    ticker = (request.args.get('ticker') or '').upper().strip()
+    path = request.args.get('path') or ''
+    if not ticker and not path:
+        return jsonify({'ok': False, 'error': 'ticker or path required'}), 400
+    # chart_data writes a memory-mapped sidecar next to the CSV, so only snapshot folders qualify.
+    if path and not _inside(path, current_app.config['DATA_DIR']):
+        return jsonify({'ok': False, 'error': 'access denied'}), 403
+    try:
+        payload = chart_data(
+            ticker=ticker,
+            folder_path=path,
+            data_dir=current_app.config['DATA_DIR'],
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            interval=request.args.get('interval'),
+            points=int(request.args.get('points', 1000)),
+        )
+    except ChartDataUnavailable as e:
+        return jsonify({'ok': False, 'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    return jsonify({'ok': True, **payload})
+
+
+@bp.route('/watchlist', methods=['GET'])
+def watchlist_status():
+    return jsonify({'ok': True, 'watchlist': current_app.extensions['refresh_scheduler'].status()})
+
+
+@bp.route('/watchlist', methods=['POST'])
+def watchlist_update():
+    data = request.get_json(silent=True) or {}
+    try:
+        add, remove = parse_tickers(data.get('add'), 'add'), parse_tickers(data.get('remove'), 'remove')
+    except ValueError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    scheduler = current_app.extensions['refresh_scheduler']
+    for ticker in add:
+        scheduler.add(ticker)
+    for ticker in remove:
+        scheduler.remove(ticker)
+    return jsonify({'ok': True, 'watchlist': scheduler.status()})
+
+
+@bp.route('/watchlist/refresh', methods=['POST'])
+def watchlist_refresh():
+    # Runs on the scheduler (within REFRESH_CONCURRENCY), not this request; poll GET /data/watchlist.
+    data = request.get_json(silent=True) or {}
+    try:
+        tickers = parse_tickers(data.get('tickers'), 'tickers')
+    except ValueError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    queued = current_app.extensions['refresh_scheduler'].request_refresh(tickers or None)
+    return jsonify({'ok': True, 'queued': queued}), 202
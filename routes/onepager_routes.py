@@ -0,0 +1,56 @@
+from flask import Blueprint, request, render_template, jsonify, current_app
+from services.onepager import build_onepager
+
+bp = Blueprint('onepager', __name__)
+
+
+def _params(source):
+    peers = source.get('peers') or []
+    if isinstance(peers, str):
+        peers = [p.strip() for p in peers.split(',') if p.strip()]
+    return {
+        'ticker': (source.get('ticker') or '').upper().strip(),
+        'folder_path': source.get('path') or '',
+        'wacc': float(source.get('wacc', 0.10)),
+        'terminal_growth': float(source.get('terminal_growth', 0.03)),
+        'forecast_years': int(source.get('forecast_years', 5)),
+        'peers': peers,
+    }
+
+
+def _build(params):
+    return build_onepager(
+        **params,
+        data_dir=current_app.config['DATA_DIR'],
+        comps_timeout=current_app.config['ONEPAGER_COMPS_TIMEOUT'],
+    )
+
+
+@bp.route('/', methods=['GET'])
+def view():
+    try:
+        params = _params(request.args)
+    except (TypeError, ValueError) as e:
+        # Echo the raw values back into the form so the user can correct them.
+        raw = {k: request.args.get(k, '') for k in ('ticker', 'wacc', 'terminal_growth', 'forecast_years')}
+        raw['peers'] = [p for p in (request.args.get('peers') or '').split(',') if p]
+        return render_template('onepager.html', error=f'Invalid parameter: {e}', params=raw)
+    if not params['ticker'] and not params['folder_path']:
+        return render_template('onepager.html', params=params)
+    page = _build(params)
+    if not page['ok']:
+        return render_template('onepager.html', error=page['error'], params=params)
+    return render_template('onepager.html', page=page, params=params)
+
+
+@bp.route('/api', methods=['GET', 'POST'])
+def api():
+    source = (request.get_json(silent=True) or {}) if request.method == 'POST' else request.args
+    try:
+        params = _params(source)
+    except (TypeError, ValueError) as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    if not params['ticker'] and not params['folder_path']:
+        return jsonify({'ok': False, 'error': 'ticker or path required'}), 400
+    page = _build(params)
+    return jsonify(page), (200 if page['ok'] else 404)
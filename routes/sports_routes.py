@@ -1,12 +1,8 @@
-import os
-import requests
 from flask import Blueprint, render_template, jsonify
+from services.providers import ProviderError, ProviderNotConfigured, get_sports_provider
 
 bp = Blueprint('sports', __name__)
 
-API_KEY = os.getenv('API_FOOTBALL_KEY')
-API_HOST = os.getenv('API_FOOTBALL_HOST', 'v3.football.api-sports.io')
-
 
 @bp.route('/', methods=['GET'])
 def view():
@@ -15,12 +11,10 @@ def view():
 
 @bp.route('/live', methods=['GET'])
 def live():
-    if not API_KEY:
-        return jsonify({'ok': False, 'error': 'Set API_FOOTBALL_KEY in .env'}), 400
-    url = f"https://{API_HOST}/fixtures?live=all"
-    headers = {"x-rapidapi-key": API_KEY, "x-rapidapi-host": API_HOST}
-    response = requests.get(url, headers=headers, timeout=20)
     try:
-        return jsonify({'ok': True, 'data': response.json()})
-    except Exception:
-        return jsonify({'ok': False, 'status': response.status_code, 'text': response.text[:500]}), 502
+        data = get_sports_provider().live_fixtures()
+    except ProviderNotConfigured as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    except ProviderError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 502
+    return jsonify({'ok': True, 'data': data})
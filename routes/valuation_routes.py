@@ -1,5 +1,7 @@
 from flask import Blueprint, request, render_template, jsonify, current_app, send_file
-from services.valuation import simple_dcf, comparables_table, export_valuation_xlsx
+from services.providers import ProviderError
+from services.utils import parse_tickers
+from services.valuation import simple_dcf, comparables_table, export_valuation_xlsx, reverse_dcf_table
 
 bp = Blueprint('valuation', __name__)
 
@@ -16,17 +18,63 @@ def dcf_calc():
     for r in required:
         if r not in data:
             return jsonify({'ok': False, 'error': f'missing {r}'}), 400
-    res = simple_dcf(**data, data_dir=current_app.config['DATA_DIR'])
+    try:
+        res = simple_dcf(**data, data_dir=current_app.config['DATA_DIR'])
+    except ProviderError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 502
     return jsonify({'ok': True, 'dcf': res})
 
 
+@bp.route('/reverse-dcf', methods=['POST'])
+def reverse_dcf_calc():
+    data = request.get_json() or {}
+    try:
+        tickers = parse_tickers(data.get('tickers') or data.get('ticker') or None)
+    except ValueError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    if not tickers:
+        return jsonify({'ok': False, 'error': 'ticker or tickers required'}), 400
+    solve_for = data.get('solve_for', 'growth')
+    needed = {'growth': 'wacc', 'wacc': 'growth'}.get(solve_for)
+    if needed is None:
+        return jsonify({'ok': False, 'error': 'solve_for must be growth or wacc'}), 400
+    for r in [needed, 'terminal_growth']:
+        if r not in data:
+            return jsonify({'ok': False, 'error': f'missing {r}'}), 400
+    try:
+        rows = reverse_dcf_table(
+            tickers,
+            wacc=data.get('wacc'),
+            terminal_growth=data['terminal_growth'],
+            forecast_years=int(data.get('forecast_years', 5)),
+            growth=data.get('growth'),
+            solve_for=solve_for,
+            data_dir=current_app.config['DATA_DIR'],
+            prices=data.get('prices'),
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
+    return jsonify({'ok': True, 'rows': rows})
+
+
 @bp.route('/comps', methods=['POST'])
 def comps():
     data = request.get_json() or {}
     tickers = data.get('tickers', [])
     if not tickers:
         return jsonify({'ok': False, 'error': 'tickers required'}), 400
-    tbl = comparables_table(tickers)
+    try:
+        tbl = comparables_table(
+            tickers,
+            source=data.get('source', 'local'),
+            data_dir=current_app.config['DATA_DIR'],
+            as_of=data.get('as_of'),
+            cross_check=bool(data.get('cross_check')),
+        )
+    except ProviderError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 502
+    except ValueError as e:
+        return jsonify({'ok': False, 'error': str(e)}), 400
     return jsonify({'ok': True, 'table': tbl})
 
 
@@ -1,8 +1,16 @@
+import threading
+from collections import OrderedDict
 from typing import Optional
 
 import pandas as pd
 
-from .statements import StandardizedStatements, standardize_statements
+from .statements import StandardizedStatements, snapshot_key, standardize_statements
+
+# Like the standardized statements, cached tables are shared between callers: treat them as read-only.
+CACHE_SIZE = 64
+
+_cache: 'OrderedDict[tuple, dict]' = OrderedDict()
+_cache_lock = threading.Lock()
 
 
 def _to_series(df: pd.DataFrame, name: str) -> pd.Series:
@@ -118,3 +126,31 @@ def growth_table(
         'Net Income YoY': yoy(ni).to_dict(),
         'Assets YoY': yoy(assets).to_dict(),
     }
+
+
+def analysis_tables(
+    ticker: str = '', folder_path: str = '', data_dir: str = './data', std: Optional[StandardizedStatements] = None
+):
+    """Ratios, common-size, DuPont and growth tables, cached per statements snapshot."""
+    std = _resolve_std(std, ticker, folder_path, data_dir)
+    key = snapshot_key(std)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    tables = {
+        'ratios': compute_ratios(std=std),
+        'common_size': common_size(std=std),
+        'dupont': dupont_breakdown(std=std),
+        'growth': growth_table(std=std),
+    }
+    with _cache_lock:
+        _cache[key] = tables
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return tables
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,293 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .statements import find_file
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+CSV_COLUMNS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+DTYPE = np.dtype([('t', 'i8')] + [(f, 'f8') for f in FIELDS])
+CHUNK_ROWS = 100_000
+PYRAMID_BUCKET = 16
+PYRAMID_MIN_POINTS = 2_000
+MAX_POINTS = 5_000
+MAX_BUCKETS = 1_000_000
+CACHE_SIZE = 16
+RESAMPLED_CACHE_SIZE = 8
+
+_INTERVAL_UNITS = {'m': 'min', 'h': 'h', 'd': 'D', 'wk': 'W', 'mo': 'MS', 'y': 'YS'}
+# Shortest bucket of each unit, used to bound the bucket count before resampling.
+_UNIT_MS = {'min': 60_000, 'h': 3_600_000, 'D': 86_400_000, 'W': 7 * 86_400_000,
+            'MS': 28 * 86_400_000, 'YS': 365 * 86_400_000}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class ChartDataUnavailable(Exception):
+    """Raised when no price history can be located or parsed."""
+
+
+def find_price_history(ticker: str = '', folder_path: str = '', data_dir: str = './data') -> Optional[str]:
+    if folder_path:
+        return find_file(folder_path, 'price_history.csv')
+    folder = os.path.join(data_dir, ticker.upper())
+    if not ticker or not os.path.isdir(folder):
+        return None
+    for sub in sorted(os.listdir(folder), reverse=True):
+        path = find_file(os.path.join(folder, sub), 'price_history.csv')
+        if path:
+            return path
+    return None
+
+
+def _header_skiprows(csv_path: str):
+    # Newer yfinance writes "Price"/"Ticker"/"Date" header rows; older versions a single header.
+    with open(csv_path) as fh:
+        head = [fh.readline() for _ in range(3)]
+    if len(head) > 1 and head[1].startswith('Ticker,'):
+        return [1, 2] if head[2].startswith('Date,') else [1]
+    return None
+
+
+def _parse_stamps(index) -> np.ndarray:
+    """Parse CSV timestamps to UTC epoch ms; NaT becomes ``np.iinfo('i8').min``.
+
+    Intraday yfinance stamps carry a handful of distinct UTC offsets, which pandas parses
+    slowly, so the naive part and the offset are parsed separately.
+    """
+    raw = pd.Series(np.asarray(index, dtype=object)).astype(str)
+    tail = raw.str.slice(19)
+    codes, offsets = pd.factorize(tail)
+    if all(o == '' or re.fullmatch(r'[+-]\d\d:\d\d', o) for o in offsets):
+        naive = pd.to_datetime(raw.str.slice(0, 19), errors='coerce', format='ISO8601')
+        shift = np.array([
+            (1 if o[0] == '+' else -1) * (int(o[1:3]) * 60 + int(o[4:6])) * 60_000 if o else 0 for o in offsets
+        ], dtype='i8')
+        ms = naive.values.astype('i8') // 1_000_000 - shift[codes]
+        ms[naive.isna().to_numpy()] = np.iinfo('i8').min
+        return ms
+    stamps = pd.to_datetime(raw, utc=True, errors='coerce', format='ISO8601')
+    ms = stamps.values.astype('i8') // 1_000_000
+    ms[stamps.isna().to_numpy()] = np.iinfo('i8').min
+    return ms
+
+
+def _csv_to_records(csv_path: str) -> np.ndarray:
+    parts = []
+    reader = pd.read_csv(csv_path, index_col=0, skiprows=_header_skiprows(csv_path), chunksize=CHUNK_ROWS)
+    for chunk in reader:
+        rec = np.empty(len(chunk), dtype=DTYPE)
+        rec['t'] = _parse_stamps(chunk.index)
+        for col, field in CSV_COLUMNS.items():
+            values = chunk[col] if col in chunk.columns else np.nan
+            rec[field] = pd.to_numeric(values, errors='coerce')
+        keep = (rec['t'] != np.iinfo('i8').min) & ~np.isnan(rec['close'])
+        parts.append(rec[keep])
+    if not parts:
+        return np.empty(0, dtype=DTYPE)
+    out = np.concatenate(parts)
+    if len(out) > 1 and np.any(np.diff(out['t']) < 0):
+        out = out[np.argsort(out['t'], kind='stable')]
+    return out
+
+
+def load_price_array(csv_path: str) -> np.ndarray:
+    """Return the history as a memory-mapped structured array, converting the CSV once per snapshot."""
+    npy_path = os.path.splitext(csv_path)[0] + '.npy'
+    if not os.path.exists(npy_path) or os.path.getmtime(npy_path) < os.path.getmtime(csv_path):
+        records = _csv_to_records(csv_path)
+        tmp_path = npy_path + f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as fh:
+                np.save(fh, records)
+            os.replace(tmp_path, npy_path)
+        except OSError:
+            # Read-only snapshot folder: serve from memory rather than fail.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return records
+    return np.load(npy_path, mmap_mode='r')
+
+
+def _m4_indices(y: np.ndarray, bucket: int) -> np.ndarray:
+    """Keep the first, min, max and last point of each fixed-size bucket (vectorized)."""
+    n = len(y)
+    nb = -(-n // bucket)
+    padded = np.full(nb * bucket, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(nb, bucket)
+    base = np.arange(nb) * bucket
+    filled = np.where(np.isnan(grid), np.inf, grid)
+    lo = base + np.argmin(filled, axis=1)
+    hi = base + np.argmax(np.where(np.isnan(grid), -np.inf, grid), axis=1)
+    last = np.minimum(base + bucket - 1, n - 1)
+    return np.unique(np.concatenate([base, lo, hi, last]))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``threshold`` points preserving the visual shape."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='f8')
+    y = np.asarray(y, dtype='f8')
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+class _Series:
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.levels = [np.arange(len(data))]
+        while len(self.levels[-1]) > PYRAMID_MIN_POINTS:
+            prev = self.levels[-1]
+            nxt = prev[_m4_indices(np.asarray(data['close'][prev]), PYRAMID_BUCKET)]
+            if len(nxt) >= len(prev):
+                break
+            self.levels.append(nxt)
+        self.resampled: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self.lock = threading.Lock()
+
+
+def _series_for(csv_path: str) -> _Series:
+    mtime = os.path.getmtime(csv_path)
+    with _cache_lock:
+        hit = _cache.get(csv_path)
+        if hit and hit[0] == mtime:
+            return hit[1]
+    series = _Series(load_price_array(csv_path))
+    with _cache_lock:
+        _cache[csv_path] = (mtime, series)
+        while len(_cache) > CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+    return series
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _pandas_rule(interval: str) -> str:
+    match = re.fullmatch(r'(\d*)(m|h|d|wk|mo|y)', interval.strip().lower())
+    if not match:
+        raise ValueError(f'unsupported interval: {interval}')
+    return f'{match.group(1) or 1}{_INTERVAL_UNITS[match.group(2)]}'
+
+
+def _resample(data: np.ndarray, rule: str) -> np.ndarray:
+    count, unit = re.fullmatch(r'(\d+)(\D+)', rule).groups()
+    span = int(data['t'][-1] - data['t'][0]) if len(data) else 0
+    if int(count) == 0 or span // (int(count) * _UNIT_MS[unit]) > MAX_BUCKETS:
+        raise ValueError(f'interval {rule} is too fine for this history (more than {MAX_BUCKETS} buckets)')
+    frame = pd.DataFrame({f: data[f] for f in FIELDS}, index=pd.to_datetime(data['t'], unit='ms', utc=True))
+    agg = frame.resample(rule).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).dropna(subset=['close'])
+    out = np.empty(len(agg), dtype=DTYPE)
+    out['t'] = agg.index.asi8 // 1_000_000
+    for f in FIELDS:
+        out[f] = agg[f].to_numpy(dtype='f8')
+    return out
+
+
+def _to_ms(value) -> Optional[int]:
+    if value in (None, ''):
+        return None
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.value // 1_000_000)
+
+
+def _window(t: np.ndarray, start_ms, end_ms):
+    lo = 0 if start_ms is None else int(np.searchsorted(t, start_ms, side='left'))
+    hi = len(t) if end_ms is None else int(np.searchsorted(t, end_ms, side='right'))
+    return lo, hi
+
+
+def _payload(rows: np.ndarray) -> dict:
+    out = {'t': rows['t'].tolist()}
+    for f in FIELDS:
+        col = np.asarray(rows[f], dtype='f8')
+        out[f] = [None if v != v else v for v in col.tolist()]
+    return out
+
+
+def chart_data(
+    ticker: str = '',
+    folder_path: str = '',
+    data_dir: str = './data',
+    start=None,
+    end=None,
+    interval: Optional[str] = None,
+    points: int = 1000,
+):
+    """Serve stored OHLCV history as compact arrays.
+
+    With ``interval`` the history is resampled (open first, high max, low min, close last,
+    volume sum), and bars beyond ``points`` are thinned with LTTB on the close. Otherwise the
+    window is reduced to ``points`` with LTTB on the close, starting from the coarsest cached
+    pyramid level that still has enough points.
+    """
+    csv_path = find_price_history(ticker, folder_path, data_dir)
+    if not csv_path:
+        raise ChartDataUnavailable('Could not locate price history. Run /data/fetch first or provide a valid folder.')
+    series = _series_for(csv_path)
+    start_ms, end_ms = _to_ms(start), _to_ms(end)
+    points = max(3, min(int(points), MAX_POINTS))
+
+    if interval:
+        rule = _pandas_rule(interval)
+        with series.lock:
+            resampled = series.resampled.get(rule)
+            if resampled is None:
+                resampled = series.resampled[rule] = _resample(series.data, rule)
+                while len(series.resampled) > RESAMPLED_CACHE_SIZE:
+                    series.resampled.popitem(last=False)
+            series.resampled.move_to_end(rule)
+        lo, hi = _window(resampled['t'], start_ms, end_ms)
+        rows = resampled[lo:hi]
+        method = 'resample'
+        if len(rows) > points:
+            rows = rows[lttb_indices(rows['t'], rows['close'], points)]
+            method = 'resample+lttb'
+        return {'snapshot': os.path.dirname(csv_path), 'method': method, 'interval': interval,
+                'source_points': hi - lo, 'points': len(rows), **_payload(rows)}
+
+    data = series.data
+    level_no, idx = 0, None
+    for level_no in range(len(series.levels) - 1, -1, -1):
+        level = series.levels[level_no]
+        lo, hi = _window(data['t'][level], start_ms, end_ms)
+        idx = level[lo:hi]
+        if len(idx) >= 2 * points:
+            break
+    source_points = _window(data['t'], start_ms, end_ms)
+    source_points = source_points[1] - source_points[0]
+    method = 'raw'
+    if len(idx) > points:
+        rows = data[idx]
+        keep = lttb_indices(rows['t'], rows['close'], points)
+        idx = idx[keep]
+        method = 'lttb'
+    rows = np.asarray(data[idx])
+    return {'snapshot': os.path.dirname(csv_path), 'method': method, 'level': level_no,
+            'source_points': source_points, 'points': len(rows), **_payload(rows)}
@@ -1,31 +1,94 @@
+import datetime as dt
+import json
+import os
+import threading
+from typing import Optional
+
 import pandas as pd
-import yfinance as yf
+from werkzeug.utils import secure_filename
+
+from .providers import get_market_provider
+from .statements import snapshot_folders
+from .utils import ensure_dir
 
 
 def fetch_yf_history(ticker: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
-    """Fetch OHLCV history from Yahoo Finance."""
-    df = yf.download(ticker, start=start, end=end, interval=interval, auto_adjust=False, progress=False)
-    if not isinstance(df, pd.DataFrame) or df.empty:
-        raise ValueError(f'No price history for {ticker}')
-    df.index.name = 'Date'
-    return df
+    """Fetch OHLCV history from the configured market data provider (Yahoo Finance by default)."""
+    return get_market_provider().history(ticker, start=start, end=end, interval=interval)
 
 
 def fetch_yf_statements(ticker: str):
-    """Fetch income statement, balance sheet, and cash flow (annual) from Yahoo Finance."""
-    t = yf.Ticker(ticker)
-    is_df = getattr(t, 'income_stmt', None)
-    if is_df is None or is_df.empty:
-        is_df = getattr(t, 'financials', None)
-    bs_df = getattr(t, 'balance_sheet', None)
-    cf_df = getattr(t, 'cashflow', None)
-
-    def tidy(df):
-        if df is None or df.empty:
-            return pd.DataFrame()
-        out = df.copy()
-        out.index.name = 'Account'
-        out.reset_index(inplace=True)
-        return out
-
-    return tidy(is_df), tidy(bs_df), tidy(cf_df)
+    """Fetch income statement, balance sheet, and cash flow (annual) from the configured provider."""
+    return get_market_provider().statements(ticker)
+
+
+def fetch_quote(ticker: str) -> dict:
+    """Fetch price, share count and headline multiples from the configured provider."""
+    return get_market_provider().quote(ticker)
+
+
+SNAPSHOT_FILES = ('price_history.csv', 'income_statement.csv', 'balance_sheet.csv', 'cash_flow.csv')
+
+
+def save_snapshot(
+    data_dir: str,
+    ticker: str,
+    hist: pd.DataFrame,
+    statements,
+    quote: Optional[dict] = None,
+    date_tag: Optional[str] = None,
+    skip_unchanged: bool = False,
+):
+    """Write a fetch snapshot to ``<data_dir>/<TICKER>/<date_tag>/``.
+
+    Returns ``(folder, files, changed)``. With ``skip_unchanged`` nothing is written when the
+    price history and statements are byte-identical to the latest snapshot, which is returned instead.
+    """
+    is_df, bs_df, cf_df = statements
+    contents = dict(zip(SNAPSHOT_FILES, (
+        hist.to_csv(),
+        is_df.to_csv(index=False),
+        bs_df.to_csv(index=False),
+        cf_df.to_csv(index=False),
+    )))
+    ticker_dir = os.path.join(data_dir, secure_filename(ticker.upper()))
+
+    if skip_unchanged:
+        latest = snapshot_folders(data_dir, secure_filename(ticker.upper()))
+        if latest and _matches(latest[0], contents):
+            return latest[0], _snapshot_files(latest[0]), False
+
+    save_dir = ensure_dir(os.path.join(ticker_dir, date_tag or dt.datetime.now().strftime('%Y%m%d_%H%M%S')))
+    for name, text in contents.items():
+        _write_atomic(os.path.join(save_dir, name), text)
+    # Share count and quote fields are cached per snapshot for point-in-time multiples.
+    if quote:
+        _write_atomic(os.path.join(save_dir, 'quote.json'), json.dumps(quote, default=str))
+    return save_dir, _snapshot_files(save_dir), True
+
+
+def _write_atomic(path: str, text: str) -> None:
+    # Fetches within the same second share a folder; never let a reader see a half-written file.
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', newline='') as fh:
+        fh.write(text)
+    os.replace(tmp_path, path)
+
+
+def _matches(folder: str, contents: dict) -> bool:
+    for name, text in contents.items():
+        path = os.path.join(folder, name)
+        if not os.path.exists(path):
+            return False
+        with open(path, newline='') as fh:
+            if fh.read() != text:
+                return False
+    return True
+
+
+def _snapshot_files(folder: str) -> dict:
+    names = SNAPSHOT_FILES + ('quote.json',)
+    return {
+        os.path.splitext(name)[0]: os.path.join(folder, name)
+        for name in names if os.path.exists(os.path.join(folder, name))
+    }
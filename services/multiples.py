@@ -0,0 +1,168 @@
+import datetime as dt
+import json
+import os
+import re
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .charts import load_price_array
+from .data_fetch import fetch_quote
+from .statements import snapshot_folders, standardize_statements
+
+INPUTS = ('net_income', 'ebitda', 'revenue', 'equity', 'short_debt', 'long_debt', 'cash', 'price', 'shares')
+_ITEMS = {
+    'net_income': ('income_statement', 'Net Income'),
+    'ebitda': ('income_statement', 'EBITDA'),
+    'revenue': ('income_statement', 'Total Revenue'),
+    'equity': ('balance_sheet', 'Total Equity'),
+    'short_debt': ('balance_sheet', 'Short Term Debt'),
+    'long_debt': ('balance_sheet', 'Long Term Debt'),
+    'cash': ('balance_sheet', 'Cash & ST Investments'),
+}
+
+
+def _snapshot_time(folder: str) -> dt.datetime:
+    try:
+        return dt.datetime.strptime(os.path.basename(folder), '%Y%m%d_%H%M%S')
+    except ValueError:
+        return dt.datetime.fromtimestamp(os.path.getmtime(folder))
+
+
+def _as_of_cutoff(as_of) -> Optional[dt.datetime]:
+    """Naive cutoff for ``as_of``; a bare date (``'2023-03-01'`` or a ``date``) means the end of that day."""
+    if as_of in (None, ''):
+        return None
+    date_only = (isinstance(as_of, dt.date) and not isinstance(as_of, dt.datetime)) or (
+        isinstance(as_of, str) and re.fullmatch(r'\d{4}-?\d{2}-?\d{2}', as_of.strip()) is not None
+    )
+    ts = pd.Timestamp(as_of.strip() if isinstance(as_of, str) else as_of)
+    if date_only:
+        ts = ts + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    return ts.to_pydatetime().replace(tzinfo=None)
+
+
+def find_snapshot(data_dir: str, ticker: str, as_of: Optional[dt.datetime] = None) -> Optional[str]:
+    """Newest snapshot folder fetched on or before ``as_of`` that has statements."""
+    for folder in snapshot_folders(data_dir, ticker.upper()):
+        if as_of is not None and _snapshot_time(folder) > as_of:
+            continue
+        statements = ('income_statement.csv', 'balance_sheet.csv', 'cash_flow.csv')
+        if all(os.path.exists(os.path.join(folder, f)) for f in statements):
+            return folder
+    return None
+
+
+def _cached_shares(folder: str) -> Optional[float]:
+    path = os.path.join(folder, 'quote.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        shares = json.load(fh).get('shares')
+    try:
+        return float(shares) if shares is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _close_as_of(folder: str, as_of: Optional[dt.datetime]):
+    path = os.path.join(folder, 'price_history.csv')
+    if not os.path.exists(path):
+        return None, None
+    data = load_price_array(path)
+    if not len(data):
+        return None, None
+    end = len(data)
+    if as_of is not None:
+        cutoff = pd.Timestamp(as_of).tz_localize('UTC') if pd.Timestamp(as_of).tzinfo is None else pd.Timestamp(as_of)
+        end = int(np.searchsorted(data['t'], cutoff.value // 1_000_000, side='right'))
+    if end == 0:
+        return None, None
+    row = data[end - 1]
+    return float(row['close']), pd.Timestamp(int(row['t']), unit='ms').strftime('%Y-%m-%d')
+
+
+def _period_as_of(periods: List[str], as_of: Optional[dt.datetime]) -> Optional[str]:
+    dated = []
+    for p in periods:
+        try:
+            dated.append((pd.Timestamp(p).to_pydatetime().replace(tzinfo=None), p))
+        except (TypeError, ValueError):
+            continue
+    eligible = [d for d in dated if as_of is None or d[0] <= as_of]
+    return max(eligible)[1] if eligible else None
+
+
+def _item(df: pd.DataFrame, item: str, period: str) -> float:
+    row = df[df['Item'] == item]
+    if row.empty or period not in row.columns:
+        return np.nan
+    return float(pd.to_numeric(row.iloc[0][period], errors='coerce'))
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def local_multiples(tickers, data_dir: str = './data', as_of=None, cross_check: bool = False):
+    """Market cap, EV, P/E, EV/EBITDA, EV/Sales and P/B from stored snapshots.
+
+    For each ticker the newest snapshot fetched on or before ``as_of`` is used, with the latest
+    fiscal period ending on or before ``as_of``, the last close on or before ``as_of`` and the
+    share count cached in that snapshot; a bare date includes everything fetched or traded that
+    day. Ratios with a non-positive denominator are ``None``. With ``cross_check`` the live Yahoo
+    values are added as ``yahoo_*`` fields.
+    """
+    as_of = _as_of_cutoff(as_of)
+    tickers = [t.upper() for t in tickers]
+    meta, values, errors = [], {k: [] for k in INPUTS}, {}
+
+    for tk in tickers:
+        folder = find_snapshot(data_dir, tk, as_of)
+        if folder is None:
+            errors[tk] = 'no snapshot on or before as_of' if as_of else 'no stored snapshot; run /data/fetch first'
+            continue
+        std = standardize_statements(folder_path=folder)
+        period = _period_as_of(std.periods, as_of) if std.ok else None
+        if period is None:
+            errors[tk] = std.error or 'no fiscal period on or before as_of'
+            continue
+        price, price_date = _close_as_of(folder, as_of)
+        for key, (frame, item) in _ITEMS.items():
+            values[key].append(_item(getattr(std, frame), item, period))
+        values['price'].append(price if price is not None else np.nan)
+        shares = _cached_shares(folder)
+        values['shares'].append(shares if shares is not None else np.nan)
+        meta.append({'ticker': tk, 'snapshot': folder, 'period': period, 'price_date': price_date})
+
+    v = {k: np.asarray(arr, dtype='f8') for k, arr in values.items()}
+    debt = np.nan_to_num(v['short_debt']) + np.nan_to_num(v['long_debt'])
+    market_cap = v['price'] * v['shares']
+    ev = market_cap + debt - np.nan_to_num(v['cash'])
+    out = {
+        'price': v['price'],
+        'shares': v['shares'],
+        'marketCap': market_cap,
+        'enterpriseValue': ev,
+        'pe': _ratio(market_cap, v['net_income']),
+        'evToEbitda': _ratio(ev, v['ebitda']),
+        'evToSales': _ratio(ev, v['revenue']),
+        'pb': _ratio(market_cap, v['equity']),
+    }
+
+    rows = []
+    for i, m in enumerate(meta):
+        row = dict(m)
+        row.update({k: (None if np.isnan(arr[i]) else float(arr[i])) for k, arr in out.items()})
+        if cross_check:
+            try:
+                q = fetch_quote(m['ticker'])
+                row.update({'yahoo_pe': q.get('pe'), 'yahoo_evToEbitda': q.get('evToEbitda'),
+                            'yahoo_marketCap': q.get('marketCap')})
+            except Exception as e:
+                row['yahoo_error'] = str(e)
+        rows.append(row)
+    rows.extend({'ticker': tk, 'error': msg} for tk, msg in errors.items())
+    return rows
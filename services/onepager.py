@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List, Optional
+
+from .analysis import common_size, compute_ratios, dupont_breakdown, growth_table
+from .multiples import find_snapshot
+from .statements import StandardizedStatements, snapshot_key, standardize_statements
+from .valuation import comparables_table, simple_dcf
+
+CACHE_SIZE = 64
+CACHE_TTL = 300.0
+
+# Sections that call an upstream (DCF needs the quote, comps may need Yahoo) get their own pools:
+# a timed-out call keeps its thread, and must not queue the analysis tables of later pages behind it.
+_executors = {
+    'analysis': ThreadPoolExecutor(max_workers=8, thread_name_prefix='onepager'),
+    'dcf': ThreadPoolExecutor(max_workers=4, thread_name_prefix='onepager-dcf'),
+    'comps': ThreadPoolExecutor(max_workers=4, thread_name_prefix='onepager-comps'),
+}
+_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is None:
+            return None
+        stored_at, value = hit
+        if stored_at is not None and time.monotonic() - stored_at > CACHE_TTL:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key, value, pin: bool = False):
+    with _cache_lock:
+        _cache[key] = (None if pin else time.monotonic(), value)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _timed(t0: float, fn, *args, **kwargs):
+    """Run ``fn`` and report ``elapsed_ms`` since ``t0`` (the submission time, so queueing counts)."""
+    try:
+        data = fn(*args, **kwargs)
+        return {'ok': True, 'data': data, 'elapsed_ms': round((time.perf_counter() - t0) * 1000, 2)}
+    except Exception as e:
+        return {'ok': False, 'error': str(e), 'elapsed_ms': round((time.perf_counter() - t0) * 1000, 2)}
+
+
+def _comps_key(tickers, data_dir: str) -> tuple:
+    # Comps read each ticker's latest stored snapshot (statements, close and cached share count),
+    # so a re-fetched peer must miss the page cache just like a re-fetched main ticker.
+    key = []
+    for tk in tickers:
+        folder = find_snapshot(data_dir, tk)
+        mtimes = []
+        if folder is not None:
+            for name in ('income_statement.csv', 'balance_sheet.csv', 'cash_flow.csv', 'price_history.csv', 'quote.json'):
+                path = os.path.join(folder, name)
+                mtimes.append(os.path.getmtime(path) if os.path.exists(path) else None)
+        key.append((tk, folder and os.path.realpath(folder), *mtimes))
+    return tuple(key)
+
+
+def _common_size_records(std: StandardizedStatements):
+    cs = common_size(std=std)
+    return {name: df.to_dict(orient='records') for name, df in cs.items()}
+
+
+def build_onepager(
+    ticker: str = '',
+    folder_path: str = '',
+    data_dir: str = './data',
+    wacc: float = 0.10,
+    terminal_growth: float = 0.03,
+    forecast_years: int = 5,
+    peers: Optional[List[str]] = None,
+    comps_timeout: float = 10.0,
+    section_timeout: float = 30.0,
+    pin: bool = False,
+):
+    """Assemble the one-pager: standardize once, then run analysis, DCF and comps concurrently.
+
+    Each section reports ``ok``/``elapsed_ms`` and either ``data`` or ``error``, so a slow or
+    failing comps upstream only degrades that section. Fully successful pages are cached per
+    statements snapshot (the ticker's and every peer's) and parameter set for ``CACHE_TTL`` seconds. With ``pin`` the page is
+    rebuilt and cached without the TTL, until it is evicted or the snapshot changes; the refresh
+    scheduler pins the pages it pre-warms so they outlive the gap between off-peak refreshes.
+    """
+    t0 = time.perf_counter()
+    ticker = (ticker or '').upper().strip()
+    peers = [p.upper().strip() for p in (peers or []) if p and p.strip()]
+
+    std_section = _timed(
+        time.perf_counter(), standardize_statements, ticker=ticker, folder_path=folder_path, data_dir=data_dir
+    )
+    std = std_section.pop('data', None)
+    if not std_section['ok'] or std.error:
+        return {
+            'ok': False,
+            'error': std_section.get('error') or std.error,
+            'ticker': ticker,
+            'timings': {'standardize': std_section['elapsed_ms']},
+        }
+
+    comp_set = ([ticker] + [p for p in peers if p != ticker]) if ticker else peers
+    key = (
+        snapshot_key(std), _comps_key(comp_set, data_dir),
+        ticker, float(wacc), float(terminal_growth), int(forecast_years), tuple(peers),
+    )
+    cached = None if pin else _cache_get(key)
+    if cached is not None:
+        return {**cached, 'cached': True, 'total_ms': round((time.perf_counter() - t0) * 1000, 2)}
+
+    def submit(pool, fn, *args, **kwargs):
+        return _executors[pool].submit(_timed, time.perf_counter(), fn, *args, **kwargs)
+
+    futures = {
+        'ratios': submit('analysis', compute_ratios, std=std),
+        'common_size': submit('analysis', _common_size_records, std),
+        'dupont': submit('analysis', dupont_breakdown, std=std),
+        'growth': submit('analysis', growth_table, std=std),
+    }
+    if ticker:
+        futures['dcf'] = submit(
+            'dcf', simple_dcf, ticker, float(wacc), float(terminal_growth), int(forecast_years), data_dir, std
+        )
+    if comp_set:
+        futures['comps'] = submit('comps', comparables_table, comp_set, data_dir=data_dir)
+
+    submitted = time.perf_counter()
+    sections = {}
+    for name, future in futures.items():
+        timeout = comps_timeout if name == 'comps' else section_timeout
+        remaining = max(0.0, timeout - (time.perf_counter() - submitted))
+        try:
+            sections[name] = future.result(timeout=remaining)
+        except FutureTimeout:
+            future.cancel()
+            sections[name] = {
+                'ok': False,
+                'error': f'timed out after {timeout}s',
+                'elapsed_ms': round((time.perf_counter() - submitted) * 1000, 2),
+            }
+
+    result = {
+        'ok': True,
+        'ticker': ticker,
+        'snapshot': std.folder,
+        'periods': std.periods,
+        'params': {
+            'wacc': float(wacc),
+            'terminal_growth': float(terminal_growth),
+            'forecast_years': int(forecast_years),
+            'peers': peers,
+        },
+        'sections': sections,
+        'timings': {'standardize': std_section['elapsed_ms'], **{n: s['elapsed_ms'] for n, s in sections.items()}},
+        'degraded': sorted(n for n, s in sections.items() if not s['ok']),
+        'cached': False,
+    }
+    if not result['degraded']:
+        _cache_put(key, result, pin=pin)
+    return {**result, 'total_ms': round((time.perf_counter() - t0) * 1000, 2)}
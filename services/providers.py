@@ -0,0 +1,349 @@
+import json
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import requests
+import yfinance as yf
+
+from .utils import ensure_dir
+
+STATEMENT_FILES = ('income_statement.csv', 'balance_sheet.csv', 'cash_flow.csv')
+
+
+class ProviderError(Exception):
+    """Raised when an upstream data provider cannot serve a request."""
+
+
+class ProviderNotConfigured(ProviderError):
+    """Raised when a provider is missing credentials or fixtures."""
+
+
+@contextmanager
+def _upstream(what: str):
+    """Re-raise anything but ``ProviderError`` from an upstream call as ``ProviderError``."""
+    try:
+        yield
+    except ProviderError:
+        raise
+    except Exception as e:
+        raise ProviderError(f'{what} failed: {e}') from e
+
+
+class MarketDataProvider(ABC):
+    """Source of prices, annual statements and quote fields for a ticker.
+
+    Every method raises ``ProviderError`` when the upstream cannot serve the request.
+    """
+
+    @abstractmethod
+    def history(self, ticker: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
+        """Return OHLCV history indexed by ``Date``."""
+
+    @abstractmethod
+    def statements(self, ticker: str):
+        """Return ``(income_statement, balance_sheet, cash_flow)`` frames with an ``Account`` column."""
+
+    @abstractmethod
+    def quote(self, ticker: str) -> dict:
+        """Return a flat dict with keys price, shares, pe, forwardPE, evToEbitda, marketCap, beta."""
+
+
+class SportsProvider(ABC):
+    """Source of live football fixtures."""
+
+    @abstractmethod
+    def live_fixtures(self) -> dict:
+        """Return the upstream live fixtures payload."""
+
+
+class YahooProvider(MarketDataProvider):
+    def history(self, ticker: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
+        with _upstream(f'{ticker} history'):
+            df = yf.download(ticker, start=start, end=end, interval=interval, auto_adjust=False, progress=False)
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            raise ProviderError(f'No price history for {ticker}')
+        df.index.name = 'Date'
+        return df
+
+    def statements(self, ticker: str):
+        with _upstream(f'{ticker} statements'):
+            t = yf.Ticker(ticker)
+            is_df = getattr(t, 'income_stmt', None)
+            if is_df is None or is_df.empty:
+                is_df = getattr(t, 'financials', None)
+            bs_df = getattr(t, 'balance_sheet', None)
+            cf_df = getattr(t, 'cashflow', None)
+
+        def tidy(df):
+            if df is None or df.empty:
+                return pd.DataFrame()
+            out = df.copy()
+            out.index.name = 'Account'
+            out.reset_index(inplace=True)
+            return out
+
+        return tidy(is_df), tidy(bs_df), tidy(cf_df)
+
+    def quote(self, ticker: str) -> dict:
+        with _upstream(f'{ticker} quote'):
+            t = yf.Ticker(ticker)
+            fast_info = getattr(t, 'fast_info', {}) or {}
+            info = getattr(t, 'info', {}) or {}
+            return {
+                'price': fast_info.get('last_price') or info.get('currentPrice'),
+                'shares': fast_info.get('shares') or info.get('sharesOutstanding'),
+                'pe': info.get('trailingPE'),
+                'forwardPE': info.get('forwardPE'),
+                'evToEbitda': info.get('enterpriseToEbitda'),
+                'marketCap': info.get('marketCap'),
+                'beta': info.get('beta'),
+            }
+
+
+class ApiFootballProvider(SportsProvider):
+    def __init__(self, api_key: Optional[str] = None, api_host: Optional[str] = None, timeout: float = 20):
+        self.api_key = api_key if api_key is not None else os.getenv('API_FOOTBALL_KEY')
+        self.api_host = api_host or os.getenv('API_FOOTBALL_HOST', 'v3.football.api-sports.io')
+        self.timeout = timeout
+
+    def live_fixtures(self) -> dict:
+        if not self.api_key:
+            raise ProviderNotConfigured('Set API_FOOTBALL_KEY in .env')
+        url = f"https://{self.api_host}/fixtures?live=all"
+        headers = {"x-rapidapi-key": self.api_key, "x-rapidapi-host": self.api_host}
+        try:
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise ProviderError(f'live fixtures request failed: {e}') from e
+        try:
+            return response.json()
+        except ValueError:
+            raise ProviderError(f'upstream returned {response.status_code}: {response.text[:500]}')
+
+
+class FixtureProvider(MarketDataProvider, SportsProvider):
+    """Replays canned fixtures from disk with optional latency and error injection.
+
+    Layout: ``<fixture_dir>/<TICKER>/{price_history.csv, income_statement.csv,
+    balance_sheet.csv, cash_flow.csv, quote.json}`` and ``<fixture_dir>/sports/live.json``.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: str,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+
+    def _simulate(self, what: str):
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise ProviderError(f'injected failure for {what}')
+
+    def _path(self, *parts: str) -> str:
+        path = os.path.join(self.fixture_dir, *parts)
+        if not os.path.exists(path):
+            raise ProviderNotConfigured(f'no fixture at {path}')
+        return path
+
+    def history(self, ticker: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
+        self._simulate(f'{ticker} history')
+        path = self._path(ticker.upper(), 'price_history.csv')
+        with _upstream(f'{ticker} history'):
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            if start:
+                df = df[df.index >= pd.Timestamp(start)]
+            if end:
+                df = df[df.index < pd.Timestamp(end)]
+        if df.empty:
+            raise ProviderError(f'No price history for {ticker}')
+        df.index.name = 'Date'
+        return df
+
+    def statements(self, ticker: str):
+        self._simulate(f'{ticker} statements')
+        paths = [self._path(ticker.upper(), name) for name in STATEMENT_FILES]
+        with _upstream(f'{ticker} statements'):
+            return tuple(pd.read_csv(p) for p in paths)
+
+    def quote(self, ticker: str) -> dict:
+        self._simulate(f'{ticker} quote')
+        path = self._path(ticker.upper(), 'quote.json')
+        with _upstream(f'{ticker} quote'), open(path) as fh:
+            return json.load(fh)
+
+    def live_fixtures(self) -> dict:
+        self._simulate('live fixtures')
+        path = self._path('sports', 'live.json')
+        with _upstream('live fixtures'), open(path) as fh:
+            return json.load(fh)
+
+
+class RecordingProvider(MarketDataProvider, SportsProvider):
+    """Passes calls through to upstream providers and saves the responses as fixtures."""
+
+    def __init__(self, fixture_dir: str, market: MarketDataProvider, sports: Optional[SportsProvider] = None):
+        self.fixture_dir = fixture_dir
+        self.market = market
+        self.sports = sports
+
+    def _dir(self, *parts: str) -> str:
+        return ensure_dir(os.path.join(self.fixture_dir, *parts))
+
+    def history(self, ticker: str, start=None, end=None, interval: str = '1d') -> pd.DataFrame:
+        df = self.market.history(ticker, start=start, end=end, interval=interval)
+        df.to_csv(os.path.join(self._dir(ticker.upper()), 'price_history.csv'))
+        return df
+
+    def statements(self, ticker: str):
+        frames = self.market.statements(ticker)
+        folder = self._dir(ticker.upper())
+        for name, df in zip(STATEMENT_FILES, frames):
+            df.to_csv(os.path.join(folder, name), index=False)
+        return frames
+
+    def quote(self, ticker: str) -> dict:
+        q = self.market.quote(ticker)
+        with open(os.path.join(self._dir(ticker.upper()), 'quote.json'), 'w') as fh:
+            json.dump(q, fh, indent=2, default=str)
+        return q
+
+    def live_fixtures(self) -> dict:
+        if self.sports is None:
+            raise ProviderNotConfigured('no upstream sports provider to record from')
+        payload = self.sports.live_fixtures()
+        with open(os.path.join(self._dir('sports'), 'live.json'), 'w') as fh:
+            json.dump(payload, fh)
+        return payload
+
+
+def write_synthetic_fixtures(fixture_dir: str, ticker: str, years: int = 4, days: int = 750, seed: int = 0) -> str:
+    """Write a plausible Yahoo-shaped fixture set for ``ticker`` and return its folder."""
+    rng = np.random.default_rng(seed)
+    folder = ensure_dir(os.path.join(fixture_dir, ticker.upper()))
+
+    dates = pd.bdate_range(end=pd.Timestamp('2024-12-31'), periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, size=days)))
+    open_ = close * (1 + rng.normal(0, 0.003, size=days))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, size=days)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, size=days)))
+    hist = pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Adj Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, size=days),
+    }, index=pd.DatetimeIndex(dates, name='Date'))
+    hist.to_csv(os.path.join(folder, 'price_history.csv'))
+
+    periods = [f'{2024 - i}-12-31' for i in range(years)]
+    revenue = np.array([1e10 * (1.08 ** -i) for i in range(years)])
+
+    def frame(rows):
+        return pd.DataFrame([[name, *values] for name, values in rows], columns=['Account', *periods])
+
+    frame([
+        ('Total Revenue', revenue),
+        ('Cost Of Revenue', revenue * 0.6),
+        ('Gross Profit', revenue * 0.4),
+        ('Operating Expense', revenue * 0.2),
+        ('Operating Income', revenue * 0.2),
+        ('EBITDA', revenue * 0.25),
+        ('Net Income', revenue * 0.12),
+    ]).to_csv(os.path.join(folder, 'income_statement.csv'), index=False)
+    frame([
+        ('Total Assets', revenue * 1.5),
+        ('Total Liabilities Net Minority Interest', revenue * 0.7),
+        ('Total Equity Gross Minority Interest', revenue * 0.8),
+        ('Cash And Cash Equivalents', revenue * 0.1),
+        ('Short Term Debt', revenue * 0.05),
+        ('Long Term Debt', revenue * 0.3),
+    ]).to_csv(os.path.join(folder, 'balance_sheet.csv'), index=False)
+    frame([
+        ('Operating Cash Flow', revenue * 0.18),
+        ('Investing Cash Flow', revenue * -0.08),
+        ('Financing Cash Flow', revenue * -0.06),
+        ('Capital Expenditure', revenue * -0.06),
+        ('Reconciled Depreciation', revenue * 0.05),
+    ]).to_csv(os.path.join(folder, 'cash_flow.csv'), index=False)
+
+    shares = 1e9
+    price = float(close[-1])
+    with open(os.path.join(folder, 'quote.json'), 'w') as fh:
+        json.dump({
+            'price': price,
+            'shares': shares,
+            'pe': price * shares / float(revenue[0] * 0.12),
+            'forwardPE': None,
+            'evToEbitda': (price * shares + float(revenue[0] * 0.25)) / float(revenue[0] * 0.25),
+            'marketCap': price * shares,
+            'beta': 1.0,
+        }, fh, indent=2)
+
+    sports = ensure_dir(os.path.join(fixture_dir, 'sports'))
+    live_path = os.path.join(sports, 'live.json')
+    if not os.path.exists(live_path):
+        with open(live_path, 'w') as fh:
+            json.dump({'results': 0, 'response': []}, fh)
+    return folder
+
+
+_market_provider: MarketDataProvider = YahooProvider()
+_sports_provider: SportsProvider = ApiFootballProvider()
+
+
+def get_market_provider() -> MarketDataProvider:
+    return _market_provider
+
+
+def get_sports_provider() -> SportsProvider:
+    return _sports_provider
+
+
+def set_providers(market: Optional[MarketDataProvider] = None, sports: Optional[SportsProvider] = None):
+    global _market_provider, _sports_provider
+    if market is not None:
+        _market_provider = market
+    if sports is not None:
+        _sports_provider = sports
+
+
+def configure_providers(config) -> None:
+    """Install providers from app config.
+
+    ``MARKET_DATA_PROVIDER`` selects ``live`` (Yahoo + API-Football), ``replay``
+    (serve ``FIXTURE_DIR``) or ``record`` (live, saving responses to ``FIXTURE_DIR``).
+    """
+    mode = (config.get('MARKET_DATA_PROVIDER') or 'live').lower()
+    fixture_dir = config.get('FIXTURE_DIR', './fixtures')
+    if mode == 'live':
+        set_providers(YahooProvider(), ApiFootballProvider())
+    elif mode == 'replay':
+        provider = FixtureProvider(
+            fixture_dir,
+            latency_ms=float(config.get('PROVIDER_LATENCY_MS') or 0),
+            jitter_ms=float(config.get('PROVIDER_JITTER_MS') or 0),
+            error_rate=float(config.get('PROVIDER_ERROR_RATE') or 0),
+        )
+        set_providers(provider, provider)
+    elif mode == 'record':
+        provider = RecordingProvider(fixture_dir, YahooProvider(), ApiFootballProvider())
+        set_providers(provider, provider)
+    else:
+        raise ValueError(f'Unknown MARKET_DATA_PROVIDER: {mode}')
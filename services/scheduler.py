@@ -0,0 +1,233 @@
+import datetime as dt
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, Tuple
+
+from .analysis import analysis_tables
+from .charts import ChartDataUnavailable, chart_data
+from .data_fetch import fetch_quote, fetch_yf_history, fetch_yf_statements, save_snapshot
+from .onepager import build_onepager
+from .providers import ProviderError
+
+log = logging.getLogger(__name__)
+
+
+def parse_window(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse an off-peak window like ``"01-06"`` (hours, may wrap midnight); empty means any time."""
+    if not value:
+        return None
+    start, end = value.split('-')
+    return int(start) % 24, int(end) % 24
+
+
+class RefreshScheduler:
+    """In-process scheduler that keeps a watchlist of tickers fetched and warm.
+
+    Each ticker is refreshed every ``interval`` seconds (plus up to ``jitter`` seconds), only
+    inside the off-peak ``window`` of local hours, with at most ``max_concurrency`` fetches in
+    flight. Unchanged data does not produce a new snapshot. After a refresh the standardized
+    statements, one-pager (analysis, DCF, comps) and chart caches are pre-warmed. Failures back
+    off exponentially from ``retry`` seconds up to ``interval``.
+
+    Passes are serialized, so on-demand refreshes (``request_refresh``) share the same
+    ``max_concurrency`` budget as scheduled ones. ``clock`` and ``rng`` are injectable so tests
+    can drive ``run_pending`` directly.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        watchlist: Iterable[str] = (),
+        interval: float = 86400.0,
+        jitter: float = 900.0,
+        retry: float = 300.0,
+        window: Optional[Tuple[int, int]] = None,
+        max_concurrency: int = 2,
+        tick: float = 30.0,
+        clock: Callable[[], dt.datetime] = dt.datetime.now,
+        rng: Optional[random.Random] = None,
+    ):
+        self.data_dir = data_dir
+        self.interval = interval
+        self.jitter = jitter
+        self.retry = retry
+        self.window = window
+        self.max_concurrency = max_concurrency
+        self.tick = tick
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._requested = set()
+        self._thread: Optional[threading.Thread] = None
+        self._state = {}
+        for tk in watchlist:
+            self.add(tk)
+
+    def add(self, ticker: str) -> None:
+        ticker = ticker.upper().strip()
+        if not ticker:
+            return
+        with self._lock:
+            self._state.setdefault(ticker, {
+                'ticker': ticker,
+                'next_due': self.clock() + dt.timedelta(seconds=self.rng.uniform(0, self.jitter)),
+                'last_attempt': None,
+                'last_refresh': None,
+                'last_result': None,
+                'last_error': None,
+                'failures': 0,
+                'snapshot': None,
+                'running': False,
+            })
+
+    def remove(self, ticker: str) -> None:
+        with self._lock:
+            self._state.pop(ticker.upper().strip(), None)
+
+    def status(self):
+        with self._lock:
+            rows = [dict(s) for s in self._state.values()]
+        for row in rows:
+            for key in ('next_due', 'last_attempt', 'last_refresh'):
+                if row[key] is not None:
+                    row[key] = row[key].isoformat(timespec='seconds')
+        return sorted(rows, key=lambda r: r['ticker'])
+
+    def in_window(self, now: dt.datetime) -> bool:
+        if self.window is None:
+            return True
+        start, end = self.window
+        if start <= end:
+            return start <= now.hour < end
+        return now.hour >= start or now.hour < end
+
+    def due(self, now: Optional[dt.datetime] = None):
+        now = now or self.clock()
+        if not self.in_window(now):
+            return []
+        with self._lock:
+            return sorted(tk for tk, s in self._state.items() if not s['running'] and s['next_due'] <= now)
+
+    def request_refresh(self, tickers: Optional[Iterable[str]] = None):
+        """Queue ``tickers`` (default: the whole watchlist) for refresh now, ignoring the window.
+
+        Returns the queued tickers without waiting. The scheduler thread is woken to run them; if
+        it is not running, a one-off background pass does.
+        """
+        with self._lock:
+            wanted = [t.upper().strip() for t in tickers] if tickers else list(self._state)
+            queued = sorted({t for t in wanted if t in self._state})
+            self._requested.update(queued)
+        if queued:
+            if self._thread and self._thread.is_alive():
+                self._wake.set()
+            else:
+                threading.Thread(target=self._run_quietly, name='refresh-request', daemon=True).start()
+        return queued
+
+    def run_pending(self, force: bool = False, tickers: Optional[Iterable[str]] = None):
+        """Refresh due and requested tickers (or ``tickers``/all when ``force``) and return their status rows."""
+        with self._run_lock:
+            if force:
+                with self._lock:
+                    wanted = [t.upper() for t in tickers] if tickers else list(self._state)
+                    batch = [t for t in wanted if t in self._state and not self._state[t]['running']]
+            else:
+                batch = self.due()
+                with self._lock:
+                    requested, self._requested = self._requested, set()
+                    batch = sorted(set(batch) | {
+                        t for t in requested if t in self._state and not self._state[t]['running']
+                    })
+            if not batch:
+                return []
+            with self._lock:
+                for tk in batch:
+                    self._state[tk]['running'] = True
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency), thread_name_prefix='refresh') as pool:
+                list(pool.map(self._refresh_one, batch))
+        return [row for row in self.status() if row['ticker'] in batch]
+
+    def _refresh_one(self, ticker: str) -> None:
+        started = self.clock()
+        try:
+            hist = fetch_yf_history(ticker)
+            statements = fetch_yf_statements(ticker)
+            try:
+                quote = fetch_quote(ticker)
+            except ProviderError:
+                quote = None
+            folder, _, changed = save_snapshot(
+                self.data_dir, ticker, hist, statements, quote=quote,
+                date_tag=started.strftime('%Y%m%d_%H%M%S'), skip_unchanged=True,
+            )
+            self._prewarm(ticker)
+        except Exception as e:
+            log.warning('refresh of %s failed: %s', ticker, e)
+            with self._lock:
+                s = self._state.get(ticker)
+                if s is not None:
+                    s['failures'] += 1
+                    backoff = min(self.interval, self.retry * 2 ** (s['failures'] - 1))
+                    s.update({
+                        'last_attempt': started,
+                        'last_result': 'error',
+                        'last_error': str(e),
+                        'next_due': self.clock() + dt.timedelta(seconds=backoff),
+                        'running': False,
+                    })
+            return
+        with self._lock:
+            s = self._state.get(ticker)
+            if s is not None:
+                s.update({
+                    'last_attempt': started,
+                    'last_refresh': started,
+                    'last_result': 'updated' if changed else 'unchanged',
+                    'last_error': None,
+                    'failures': 0,
+                    'snapshot': folder,
+                    'next_due': self.clock() + dt.timedelta(seconds=self.interval + self.rng.uniform(0, self.jitter)),
+                    'running': False,
+                })
+
+    def _prewarm(self, ticker: str) -> None:
+        # build_onepager standardizes (filling the statements cache) and pins the analysis, DCF
+        # and comps sections for the default parameter set until the next refresh; /analysis/
+        # reads the per-snapshot table cache.
+        build_onepager(ticker=ticker, data_dir=self.data_dir, pin=True)
+        analysis_tables(ticker=ticker, data_dir=self.data_dir)
+        try:
+            chart_data(ticker=ticker, data_dir=self.data_dir)
+        except ChartDataUnavailable:
+            pass
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run_quietly(self) -> None:
+        try:
+            self.run_pending()
+        except Exception:
+            log.exception('refresh scheduler pass failed')
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._run_quietly()
+            self._wake.wait(self.tick)
+            self._wake.clear()
@@ -1,5 +1,7 @@
 import os
 import glob
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import List, Optional
 
@@ -26,6 +28,13 @@ KEY_MAP = {
     'Depreciation': ['Depreciation', 'Reconciled Depreciation'],
 }
 
+# Standardized results are cached per (file, mtime) and shared between callers, so treat the
+# frames as read-only (copy before mutating, as common_size does).
+CACHE_SIZE = 128
+
+_cache: 'OrderedDict[tuple, StandardizedStatements]' = OrderedDict()
+_cache_lock = threading.Lock()
+
 
 class StatementDataUnavailable(Exception):
     """Raised when standardized statements cannot be produced."""
@@ -37,6 +46,7 @@ class StandardizedStatements:
     balance_sheet: Optional[pd.DataFrame] = None
     cash_flow: Optional[pd.DataFrame] = None
     periods: List[str] = field(default_factory=list)
+    folder: Optional[str] = None
     error: Optional[str] = None
 
     @classmethod
@@ -58,15 +68,19 @@ def find_file(folder_path: str, pattern: str):
     return files[0] if files else None
 
 
-def load_latest_csv(data_dir: str, ticker_upper: str):
+def snapshot_folders(data_dir: str, ticker_upper: str) -> List[str]:
+    """Snapshot folders for a ticker, newest first (folder names are fetch timestamps)."""
     folder = os.path.join(data_dir, ticker_upper)
     if not os.path.isdir(folder):
-        return None, None, None
-    subfolders = sorted(
+        return []
+    return sorted(
         [os.path.join(folder, d) for d in os.listdir(folder) if os.path.isdir(os.path.join(folder, d))],
         reverse=True,
     )
-    for sub in subfolders:
+
+
+def load_latest_csv(data_dir: str, ticker_upper: str):
+    for sub in snapshot_folders(data_dir, ticker_upper):
         is_p = find_file(sub, 'income_statement.csv')
         bs_p = find_file(sub, 'balance_sheet.csv')
         cf_p = find_file(sub, 'cash_flow.csv')
@@ -103,6 +117,41 @@ def standardize_statements(ticker: str = '', folder_path: str = '', data_dir: st
             'Could not locate statements. Run /data/fetch first or provide a valid folder.'
         )
 
+    try:
+        key = tuple((os.path.realpath(p), os.path.getmtime(p)) for p in (is_p, bs_p, cf_p))
+    except OSError:
+        key = None
+    if key is not None:
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+
+    std = _standardize_files(is_p, bs_p, cf_p)
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = std
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return std
+
+
+def snapshot_key(std: StandardizedStatements) -> tuple:
+    """Identify the statements snapshot behind ``std`` (folder plus statement mtimes) for caches."""
+    folder = std.folder or ''
+    mtimes = []
+    for name in ('income_statement.csv', 'balance_sheet.csv', 'cash_flow.csv'):
+        path = os.path.join(folder, name)
+        mtimes.append(os.path.getmtime(path) if os.path.exists(path) else None)
+    return (os.path.realpath(folder), *mtimes)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _standardize_files(is_p: str, bs_p: str, cf_p: str) -> StandardizedStatements:
     is_df = pd.read_csv(is_p)
     bs_df = pd.read_csv(bs_p)
     cf_df = pd.read_csv(cf_p)
@@ -147,6 +196,7 @@ def standardize_statements(ticker: str = '', folder_path: str = '', data_dir: st
         balance_sheet=std_bs,
         cash_flow=std_cf,
         periods=periods,
+        folder=os.path.dirname(is_p),
     )
 
 
@@ -4,3 +4,14 @@ import os
 def ensure_dir(path: str) -> str:
     os.makedirs(path, exist_ok=True)
     return path
+
+
+def parse_tickers(value, field: str = 'tickers') -> list:
+    """Accept ``"MSFT"``, ``"AAPL,MSFT"`` or ``["AAPL", "MSFT"]``; raise ValueError for anything else."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [t.strip() for t in value.split(',') if t.strip()]
+    if isinstance(value, list) and all(isinstance(t, str) for t in value):
+        return value
+    raise ValueError(f'{field} must be a ticker string or a list of tickers')
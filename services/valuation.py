@@ -1,8 +1,12 @@
 import math
 import os
+from typing import Optional
+
+import numpy as np
 import pandas as pd
-import yfinance as yf
 
+from .data_fetch import fetch_quote
+from .multiples import local_multiples
 from .statements import StandardizedStatements, standardize_statements
 
 
@@ -16,10 +20,8 @@ def _latest_value(df: pd.DataFrame, item: str):
     return float(series.iloc[0])
 
 
-def simple_dcf(
-    ticker: str, wacc: float, terminal_growth: float, forecast_years: int = 5, data_dir: str = './data'
-):
-    std: StandardizedStatements = standardize_statements(ticker=ticker, data_dir=data_dir).ensure_ok()
+def dcf_inputs(std: StandardizedStatements) -> dict:
+    """Base FCF, trailing growth estimate and net debt from standardized statements."""
     is_df, cf_df, bs_df = std.income_statement, std.cash_flow, std.balance_sheet
 
     cfo = _latest_value(cf_df, 'CFO')
@@ -35,6 +37,26 @@ def simple_dcf(
     except Exception:
         growth = 0.05
 
+    cash = _latest_value(bs_df, 'Cash & ST Investments')
+    long_debt = _latest_value(bs_df, 'Long Term Debt')
+    short_debt = _latest_value(bs_df, 'Short Term Debt')
+    net_debt = long_debt + short_debt - cash
+
+    return {'base_fcf': base_fcf, 'growth': growth, 'net_debt': net_debt}
+
+
+def simple_dcf(
+    ticker: str,
+    wacc: float,
+    terminal_growth: float,
+    forecast_years: int = 5,
+    data_dir: str = './data',
+    std: Optional[StandardizedStatements] = None,
+):
+    std = (std or standardize_statements(ticker=ticker, data_dir=data_dir)).ensure_ok()
+    inputs = dcf_inputs(std)
+    base_fcf, growth, net_debt = inputs['base_fcf'], inputs['growth'], inputs['net_debt']
+
     years = list(range(1, int(forecast_years) + 1))
     fcfs = [base_fcf * ((1 + growth) ** t) for t in years]
     discounts = [(1 + wacc) ** t for t in years]
@@ -43,15 +65,7 @@ def simple_dcf(
     pv_terminal = terminal_value / ((1 + wacc) ** years[-1]) if isinstance(terminal_value, (int, float)) and not math.isnan(terminal_value) else 0.0
     enterprise_value = sum(pv_fcfs) + pv_terminal
 
-    ticker_obj = yf.Ticker(ticker)
-    fast_info = getattr(ticker_obj, 'fast_info', {}) or {}
-    info = getattr(ticker_obj, 'info', {}) or {}
-    shares = fast_info.get('shares') or info.get('sharesOutstanding')
-
-    cash = _latest_value(bs_df, 'Cash & ST Investments')
-    long_debt = _latest_value(bs_df, 'Long Term Debt')
-    short_debt = _latest_value(bs_df, 'Short Term Debt')
-    net_debt = long_debt + short_debt - cash
+    shares = fetch_quote(ticker).get('shares')
 
     equity_value = enterprise_value - net_debt
     price_target = (equity_value / shares) if shares else None
@@ -73,20 +87,248 @@ def simple_dcf(
     }
 
 
-def comparables_table(tickers):
+def dcf_enterprise_value(base_fcf, growth, wacc, terminal_growth, forecast_years=5, with_derivatives: bool = False):
+    """Vectorized DCF enterprise value; all arguments broadcast against each other.
+
+    Matches ``simple_dcf``: FCF grows at ``growth`` for ``forecast_years`` years, then a Gordon
+    terminal value at ``terminal_growth``. Elements with ``wacc <= terminal_growth`` are NaN.
+    With ``with_derivatives`` also returns dEV/dgrowth and dEV/dwacc.
+    """
+    f, g, w, tg, n = np.broadcast_arrays(
+        *(np.asarray(a, dtype='f8') for a in (base_fcf, growth, wacc, terminal_growth, forecast_years))
+    )
+    shape = f.shape
+    n_max = int(np.nanmax(n)) if n.size else 0
+    t = np.arange(1, n_max + 1, dtype='f8').reshape((1,) * len(shape) + (-1,))
+    fx, gx, wx, nx = f[..., None], g[..., None], w[..., None], n[..., None]
+    mask = t <= nx
+
+    ratio = (1 + gx) / (1 + wx)
+    pv = np.where(mask, fx * ratio ** t, 0.0)
+    valid = w > tg
+    spread = np.where(valid, w - tg, np.nan)
+    fcf_n = f * (1 + g) ** n
+    tv = fcf_n * (1 + tg) / spread
+    pv_tv = tv / (1 + w) ** n
+    ev = pv.sum(axis=-1) + pv_tv
+    if not with_derivatives:
+        return ev
+
+    d_pv_dg = np.where(mask, fx * t * (1 + gx) ** (t - 1) / (1 + wx) ** t, 0.0).sum(axis=-1)
+    d_tv_dg = f * n * (1 + g) ** (n - 1) * (1 + tg) / spread / (1 + w) ** n
+    d_pv_dw = np.where(mask, -t * fx * (1 + gx) ** t / (1 + wx) ** (t + 1), 0.0).sum(axis=-1)
+    d_tv_dw = -pv_tv / spread - n * pv_tv / (1 + w)
+    return ev, d_pv_dg + d_tv_dg, d_pv_dw + d_tv_dw
+
+
+def _solve_bracketed(fn, lo, hi, tol: float = 1e-10, xtol: float = 1e-10, max_iter: int = 100):
+    """Safeguarded Newton over arrays: Newton steps that stay inside the bracket, bisection otherwise.
+
+    ``fn(x)`` returns ``(residual, derivative)`` arrays. Returns ``(x, status, iterations, residual)``
+    with status ``converged``, ``no_bracket``, ``max_iter`` or ``invalid`` per element, shaped like
+    the broadcast bracket (0-d for scalar brackets).
+    """
+    shape = np.broadcast(lo, hi).shape
+    lo, hi = (np.array(np.broadcast_to(b, shape), dtype='f8', ndmin=1) for b in (lo, hi))
+    f_lo, _ = fn(lo)
+    f_hi, _ = fn(hi)
+    x = 0.5 * (lo + hi)
+    fx, dfx = fn(x)
+    status = np.full(x.shape, 'max_iter', dtype=object)
+    iterations = np.zeros(x.shape, dtype=np.int64)
+
+    invalid = ~(np.isfinite(f_lo) & np.isfinite(f_hi))
+    no_bracket = ~invalid & (np.sign(f_lo) == np.sign(f_hi)) & (f_lo != 0) & (f_hi != 0)
+    status[invalid] = 'invalid'
+    status[no_bracket] = 'no_bracket'
+    x[invalid | no_bracket] = np.nan
+    for edge, f_edge in ((lo, f_lo), (hi, f_hi)):
+        hit = ~invalid & (f_edge == 0)
+        x[hit], fx[hit], status[hit] = edge[hit], 0.0, 'converged'
+    active = status == 'max_iter'
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        done = active & ((np.abs(fx) <= tol) | (hi - lo <= xtol))
+        status[done] = 'converged'
+        active &= ~done
+        if not active.any():
+            break
+        iterations[active] += 1
+
+        left = active & (np.sign(fx) == np.sign(f_lo))
+        right = active & ~left
+        lo[left], f_lo[left] = x[left], fx[left]
+        hi[right], f_hi[right] = x[right], fx[right]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - fx / dfx
+        use_newton = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        nxt = np.where(use_newton, newton, 0.5 * (lo + hi))
+        x = np.where(active, nxt, x)
+        f_new, df_new = fn(x)
+        fx = np.where(active, f_new, fx)
+        dfx = np.where(active, df_new, dfx)
+
+    done = active & ((np.abs(fx) <= tol) | (hi - lo <= xtol))
+    status[done] = 'converged'
+    return x.reshape(shape), status.reshape(shape), iterations.reshape(shape), fx.reshape(shape)
+
+
+def reverse_dcf(
+    price,
+    shares,
+    base_fcf,
+    net_debt,
+    wacc=None,
+    terminal_growth=0.03,
+    forecast_years=5,
+    growth=None,
+    solve_for: str = 'growth',
+    bracket=None,
+    tol: float = 1e-9,
+    max_iter: int = 100,
+):
+    """Solve the DCF backwards for the FCF growth (or WACC) implied by the market price.
+
+    Inputs broadcast against each other, so one ticker over a grid of assumptions and many tickers
+    at once are the same call. Returns arrays ``implied``, ``status``, ``iterations`` and
+    ``residual`` (relative to the target enterprise value).
+    """
+    price, shares, base_fcf, net_debt, terminal_growth, forecast_years = np.broadcast_arrays(
+        *(np.asarray(a, dtype='f8') for a in (price, shares, base_fcf, net_debt, terminal_growth, forecast_years))
+    )
+    target_ev = price * shares + net_debt
+    scale = np.where(np.abs(target_ev) > 0, np.abs(target_ev), 1.0)
+
+    if solve_for == 'growth':
+        if wacc is None:
+            raise ValueError('wacc required when solving for growth')
+        wacc = np.broadcast_to(np.asarray(wacc, dtype='f8'), target_ev.shape)
+        lo, hi = bracket or (-0.99, 2.0)
+
+        def fn(g):
+            ev, d_g, _ = dcf_enterprise_value(base_fcf, g, wacc, terminal_growth, forecast_years, with_derivatives=True)
+            return (ev - target_ev) / scale, d_g / scale
+    elif solve_for == 'wacc':
+        if growth is None:
+            raise ValueError('growth required when solving for wacc')
+        growth = np.broadcast_to(np.asarray(growth, dtype='f8'), target_ev.shape)
+        lo, hi = bracket or (None, 1.0)
+        if lo is None:
+            lo = terminal_growth + 1e-4
+
+        def fn(w):
+            ev, _, d_w = dcf_enterprise_value(base_fcf, growth, w, terminal_growth, forecast_years, with_derivatives=True)
+            return (ev - target_ev) / scale, d_w / scale
+    else:
+        raise ValueError(f'solve_for must be growth or wacc, not {solve_for}')
+
+    lo = np.broadcast_to(np.asarray(lo, dtype='f8'), target_ev.shape)
+    hi = np.broadcast_to(np.asarray(hi, dtype='f8'), target_ev.shape)
+    bad = ~np.isfinite(target_ev) | (shares <= 0) | (base_fcf == 0)
+    x, status, iterations, residual = _solve_bracketed(fn, lo, hi, tol=tol, max_iter=max_iter)
+    x, status = np.where(bad, np.nan, x), np.where(bad, 'invalid', status).astype(object)
+    return {'implied': x, 'status': status, 'iterations': iterations, 'residual': residual}
+
+
+def reverse_dcf_table(
+    tickers,
+    wacc,
+    terminal_growth,
+    forecast_years: int = 5,
+    growth=None,
+    solve_for: str = 'growth',
+    data_dir: str = './data',
+    prices: Optional[dict] = None,
+):
+    """Implied growth (or WACC) for every ticker x wacc x terminal_growth (x growth) combination.
+
+    Inputs come from the latest standardized statements and the quote's price and share count;
+    ``prices`` overrides the market price per ticker. All rows are solved in one vectorized call.
+    """
+    tickers = [t.upper() for t in tickers]
+    if prices is not None and not isinstance(prices, dict):
+        raise TypeError('prices must map tickers to prices')
+    prices = {str(tk).upper(): float(p) for tk, p in (prices or {}).items()}
+    waccs = np.atleast_1d(np.asarray(wacc if wacc is not None else np.nan, dtype='f8'))
+    tgs = np.atleast_1d(np.asarray(terminal_growth, dtype='f8'))
+    growths = np.atleast_1d(np.asarray(growth if growth is not None else np.nan, dtype='f8'))
+
+    per_ticker, errors = {}, {}
+    for tk in tickers:
+        try:
+            std = standardize_statements(ticker=tk, data_dir=data_dir).ensure_ok()
+            quote = fetch_quote(tk)
+        except Exception as e:
+            errors[tk] = str(e)
+            continue
+        inputs = dcf_inputs(std)
+        price = prices.get(tk, quote.get('price'))
+        per_ticker[tk] = {**inputs, 'price': price, 'shares': quote.get('shares')}
+
+    rows = []
+    solved = [tk for tk in tickers if tk in per_ticker]
+    if solved:
+        ti, wi, gi, xi = np.meshgrid(
+            np.arange(len(solved)), np.arange(len(waccs)), np.arange(len(tgs)), np.arange(len(growths)), indexing='ij'
+        )
+        ti, wi, gi, xi = ti.ravel(), wi.ravel(), gi.ravel(), xi.ravel()
+
+        def col(key):
+            values = [per_ticker[tk][key] if per_ticker[tk][key] is not None else np.nan for tk in solved]
+            return np.array(values, dtype='f8')[ti]
+
+        res = reverse_dcf(
+            price=col('price'),
+            shares=col('shares'),
+            base_fcf=col('base_fcf'),
+            net_debt=col('net_debt'),
+            wacc=waccs[wi],
+            terminal_growth=tgs[gi],
+            forecast_years=forecast_years,
+            growth=growths[xi],
+            solve_for=solve_for,
+        )
+        for k in range(len(ti)):
+            tk = solved[ti[k]]
+            implied = res['implied'][k]
+            row = {
+                'ticker': tk,
+                'price': per_ticker[tk]['price'],
+                'terminal_growth': float(tgs[gi[k]]),
+                'forecast_years': forecast_years,
+                'status': res['status'][k],
+                'iterations': int(res['iterations'][k]),
+            }
+            if solve_for == 'growth':
+                row.update({'wacc': float(waccs[wi[k]]), 'implied_growth': None if np.isnan(implied) else float(implied),
+                            'historical_growth': per_ticker[tk]['growth']})
+            else:
+                row.update({'growth': float(growths[xi[k]]), 'implied_wacc': None if np.isnan(implied) else float(implied)})
+            rows.append(row)
+    rows.extend({'ticker': tk, 'status': 'error', 'error': msg} for tk, msg in errors.items())
+    return rows
+
+
+def comparables_table(tickers, source: str = 'local', data_dir: str = './data', as_of=None, cross_check: bool = False):
+    """Peer multiples, computed from stored snapshots (``local``) or read from Yahoo ``info`` (``yahoo``)."""
+    if source == 'local':
+        return local_multiples(tickers, data_dir=data_dir, as_of=as_of, cross_check=cross_check)
+    if source != 'yahoo':
+        raise ValueError(f'source must be local or yahoo, not {source}')
     rows = []
     for tk in tickers:
-        t = yf.Ticker(tk)
-        fast_info = getattr(t, 'fast_info', {}) or {}
-        info = getattr(t, 'info', {}) or {}
+        q = fetch_quote(tk)
         rows.append({
             'ticker': tk.upper(),
-            'price': fast_info.get('last_price') or info.get('currentPrice'),
-            'pe': info.get('trailingPE'),
-            'forwardPE': info.get('forwardPE'),
-            'evToEbitda': info.get('enterpriseToEbitda'),
-            'marketCap': info.get('marketCap'),
-            'beta': info.get('beta'),
+            'price': q.get('price'),
+            'pe': q.get('pe'),
+            'forwardPE': q.get('forwardPE'),
+            'evToEbitda': q.get('evToEbitda'),
+            'marketCap': q.get('marketCap'),
+            'beta': q.get('beta'),
         })
     return rows
 
@@ -42,12 +42,27 @@ async function runDCF() {
   out.textContent = JSON.stringify(res, null, 2);
 }
 
+async function runReverseDCF() {
+  const list = (id) => document.getElementById(id).value.split(',').map((x) => x.trim()).filter(Boolean);
+  const out = document.getElementById('rdcf_out');
+  out.textContent = 'Solving...';
+  const res = await fetchJSON('/valuation/reverse-dcf', 'POST', {
+    tickers: list('rdcf_tickers'),
+    wacc: list('rdcf_wacc').map(parseFloat),
+    terminal_growth: list('rdcf_tg').map(parseFloat),
+    forecast_years: parseInt(document.getElementById('rdcf_years').value, 10),
+  });
+  out.textContent = JSON.stringify(res, null, 2);
+}
+
 async function runComps() {
   const s = document.getElementById('comps_tickers').value.trim();
   const arr = s.split(',').map((x) => x.trim()).filter(Boolean);
   const out = document.getElementById('comps_out');
   out.textContent = 'Building...';
-  const res = await fetchJSON('/valuation/comps', 'POST', { tickers: arr });
+  const as_of = document.getElementById('comps_as_of').value || null;
+  const cross_check = document.getElementById('comps_cross_check').checked;
+  const res = await fetchJSON('/valuation/comps', 'POST', { tickers: arr, as_of, cross_check });
   out.textContent = JSON.stringify(res, null, 2);
 }
 
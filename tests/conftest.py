@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import create_app
+from services import analysis, charts, onepager, statements
+from services.providers import write_synthetic_fixtures
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    """Synthetic replay fixtures for AAA and BBB."""
+    path = tmp_path / 'fixtures'
+    for i, tk in enumerate(['AAA', 'BBB']):
+        write_synthetic_fixtures(str(path), tk, seed=i)
+    return path
+
+
+@pytest.fixture
+def replay_app(tmp_path, fixture_dir, monkeypatch):
+    """App serving market data from ``fixture_dir``, with empty data/upload dirs and cold caches."""
+    monkeypatch.setenv('DATA_DIR', str(tmp_path / 'data'))
+    monkeypatch.setenv('UPLOAD_DIR', str(tmp_path / 'uploads'))
+    monkeypatch.setenv('MARKET_DATA_PROVIDER', 'replay')
+    monkeypatch.setenv('FIXTURE_DIR', str(fixture_dir))
+    for module in (analysis, charts, onepager, statements):
+        module.clear_cache()
+    application = create_app()
+    application.config.update(TESTING=True)
+    yield application
+
+
+@pytest.fixture
+def replay_client(replay_app):
+    return replay_app.test_client()
+
+
+@pytest.fixture
+def fetch(replay_client):
+    """Fetch tickers through ``/data/fetch`` and return the snapshot folders."""
+    def _fetch(*tickers):
+        folders = []
+        for tk in tickers:
+            resp = replay_client.post('/data/fetch', json={'ticker': tk})
+            assert resp.status_code == 200
+            folders.append(resp.get_json()['folder'])
+        return folders
+    return _fetch
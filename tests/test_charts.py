@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import create_app
+from services import charts
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    folder = tmp_path / 'data' / 'AAA' / '20240101_000000'
+    folder.mkdir(parents=True)
+    n = 20_000
+    idx = pd.date_range('2023-01-02 09:30', periods=n, freq='1min', tz='America/New_York')
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.1, n))
+    pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Adj Close': close, 'Volume': 1.0,
+    }, index=pd.Index(idx, name='Date')).to_csv(folder / 'price_history.csv')
+    charts.clear_cache()
+    return folder
+
+
+def test_resample_aggregates_ohlcv(snapshot):
+    out = charts.chart_data(folder_path=str(snapshot), interval='1h')
+    frame = pd.read_csv(snapshot / 'price_history.csv', index_col=0)
+    first_hour = frame.iloc[:30]  # 09:30-09:59 local == 14:30-14:59 UTC
+    assert out['method'] == 'resample'
+    assert out['open'][0] == pytest.approx(first_hour['Open'].iloc[0])
+    assert out['high'][0] == pytest.approx(first_hour['High'].max())
+    assert out['low'][0] == pytest.approx(first_hour['Low'].min())
+    assert out['close'][0] == pytest.approx(first_hour['Close'].iloc[-1])
+    assert out['volume'][0] == 30
+    assert (snapshot / 'price_history.npy').exists()
+
+
+def test_resample_caps_points_and_bounds_cache(snapshot):
+    out = charts.chart_data(folder_path=str(snapshot), interval='1m', points=500)
+    assert out['method'] == 'resample+lttb'
+    assert out['points'] == 500 and out['source_points'] == 20_000
+    charts.chart_data(folder_path=str(snapshot), interval='1M')
+    charts.chart_data(folder_path=str(snapshot), interval=' 1m ')
+    for n in range(2, 20):
+        charts.chart_data(folder_path=str(snapshot), interval=f'{n}h')
+    series = charts._series_for(str(snapshot / 'price_history.csv'))
+    assert len(series.resampled) == charts.RESAMPLED_CACHE_SIZE
+    assert list(series.resampled)[-1] == '19h'
+    assert '1min' not in series.resampled  # evicted; '1M' and ' 1m ' reused that entry
+
+
+def test_resample_rejects_too_many_buckets(snapshot, monkeypatch):
+    monkeypatch.setattr(charts, 'MAX_BUCKETS', 1000)
+    with pytest.raises(ValueError):
+        charts.chart_data(folder_path=str(snapshot), interval='1m')
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[500] = 10.0
+    idx = charts.lttb_indices(x, y, 20)
+    assert len(idx) == 20
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx
+
+
+def test_downsample_window_uses_pyramid(snapshot):
+    full = charts.chart_data(folder_path=str(snapshot), points=500)
+    assert full['method'] == 'lttb' and full['points'] == 500 and full['level'] > 0
+    zoom = charts.chart_data(folder_path=str(snapshot), points=500, start='2023-01-05', end='2023-01-06')
+    assert zoom['source_points'] < full['source_points']
+    assert all(a < b for a, b in zip(zoom['t'], zoom['t'][1:]))
+
+
+def test_chart_route(snapshot, monkeypatch):
+    monkeypatch.setenv('DATA_DIR', str(snapshot.parents[1]))
+    monkeypatch.setenv('UPLOAD_DIR', str(snapshot.parents[2] / 'uploads'))
+    client = create_app().test_client()
+    resp = client.get('/data/chart', query_string={'ticker': 'AAA', 'interval': '1d'})
+    assert resp.status_code == 200
+    assert resp.get_json()['ok']
+    assert client.get('/data/chart', query_string={'ticker': 'AAA', 'interval': 'bogus'}).status_code == 400
+    assert client.get('/data/chart', query_string={'ticker': 'NOPE'}).status_code == 404
+
+
+def test_chart_route_rejects_paths_outside_data_dir(snapshot, tmp_path, monkeypatch):
+    outside = tmp_path / 'elsewhere'
+    outside.mkdir()
+    (outside / 'price_history.csv').write_bytes((snapshot / 'price_history.csv').read_bytes())
+    monkeypatch.setenv('DATA_DIR', str(snapshot.parents[1]))
+    monkeypatch.setenv('UPLOAD_DIR', str(snapshot.parents[2] / 'uploads'))
+    client = create_app().test_client()
+    assert client.get('/data/chart', query_string={'path': str(outside)}).status_code == 403
+    dotted = snapshot / '..' / '..' / '..' / 'elsewhere'
+    assert client.get('/data/chart', query_string={'path': str(dotted)}).status_code == 403
+    assert not (outside / 'price_history.npy').exists()
+    assert client.get('/data/chart', query_string={'path': str(snapshot)}).status_code == 200
+
+
+def test_load_price_array_falls_back_when_folder_is_read_only(snapshot, monkeypatch):
+    def deny(*args, **kwargs):
+        raise PermissionError('read-only')
+
+    monkeypatch.setattr(charts.os, 'replace', deny)
+    data = charts.load_price_array(str(snapshot / 'price_history.csv'))
+    assert len(data) == 20_000
+    assert not list(snapshot.glob('*.tmp')) and not (snapshot / 'price_history.npy').exists()
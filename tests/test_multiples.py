@@ -0,0 +1,70 @@
+import json
+import shutil
+
+import pandas as pd
+import pytest
+
+from services import multiples
+
+
+@pytest.fixture
+def data_dir(tmp_path, fixture_dir):
+    data = tmp_path / 'data'
+    for tk in ['AAA', 'BBB']:
+        src = fixture_dir / tk
+        for tag, shares in [('20230301_120000', 2e9), ('20250101_090000', 1e9)]:
+            dst = data / tk / tag
+            shutil.copytree(src, dst)
+            quote = json.loads((dst / 'quote.json').read_text())
+            (dst / 'quote.json').write_text(json.dumps({**quote, 'shares': shares}))
+    return data
+
+
+def test_local_multiples_match_statements(data_dir):
+    rows = multiples.local_multiples(['aaa', 'BBB'], data_dir=str(data_dir))
+    assert [r['ticker'] for r in rows] == ['AAA', 'BBB']
+    aaa = rows[0]
+    assert aaa['period'] == '2024-12-31'
+    prices = pd.read_csv(data_dir / 'AAA' / '20250101_090000' / 'price_history.csv', index_col=0)
+    price = prices['Close'].iloc[-1]
+    rev, ni, ebitda = 1e10, 1e10 * 0.12, 1e10 * 0.25
+    mcap = price * 1e9
+    ev = mcap + rev * 0.05 + rev * 0.3 - rev * 0.1
+    assert aaa['marketCap'] == pytest.approx(mcap)
+    assert aaa['enterpriseValue'] == pytest.approx(ev)
+    assert aaa['pe'] == pytest.approx(mcap / ni)
+    assert aaa['evToEbitda'] == pytest.approx(ev / ebitda)
+    assert aaa['evToSales'] == pytest.approx(ev / rev)
+    assert aaa['pb'] == pytest.approx(mcap / (rev * 0.8))
+
+
+def test_local_multiples_point_in_time(data_dir):
+    rows = multiples.local_multiples(['AAA'], data_dir=str(data_dir), as_of='2023-03-10')
+    row = rows[0]
+    assert row['snapshot'].endswith('20230301_120000')
+    assert row['period'] == '2022-12-31'
+    assert row['price_date'] <= '2023-03-10'
+    assert row['shares'] == 2e9
+
+    early = multiples.local_multiples(['AAA'], data_dir=str(data_dir), as_of='2020-01-01')
+    assert early == [{'ticker': 'AAA', 'error': 'no snapshot on or before as_of'}]
+
+
+def test_local_multiples_cross_check(data_dir, monkeypatch):
+    monkeypatch.setattr(multiples, 'fetch_quote', lambda tk: {'pe': 12.5, 'evToEbitda': 8.0, 'marketCap': 1.0})
+    row = multiples.local_multiples(['AAA'], data_dir=str(data_dir), cross_check=True)[0]
+    assert row['yahoo_pe'] == 12.5
+    assert row['pe'] != row['yahoo_pe']
+
+
+def test_local_multiples_bare_date_includes_that_day(data_dir):
+    prices = pd.read_csv(data_dir / 'AAA' / '20230301_120000' / 'price_history.csv', index_col=0)
+    stamps = pd.to_datetime(prices.index, utc=True)
+    day = stamps[len(stamps) // 2].strftime('%Y-%m-%d')
+    (data_dir / 'AAA' / '20230301_120000').rename(data_dir / 'AAA' / f"{day.replace('-', '')}_120000")
+
+    [row] = multiples.local_multiples(['AAA'], data_dir=str(data_dir), as_of=day)
+    assert row['snapshot'].endswith(f"{day.replace('-', '')}_120000")
+    assert row['price_date'] == day
+    [row] = multiples.local_multiples(['AAA'], data_dir=str(data_dir), as_of=f'{day} 09:00')
+    assert 'error' in row
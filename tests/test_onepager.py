@@ -0,0 +1,102 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services import onepager
+
+
+@pytest.fixture
+def client(replay_client, fetch):
+    fetch('AAA')
+    return replay_client
+
+
+def test_onepager_api_assembles_sections_and_caches(client):
+    resp = client.get('/onepager/api', query_string={'ticker': 'AAA', 'peers': 'BBB'})
+    assert resp.status_code == 200
+    page = resp.get_json()
+    assert page['ok'] and not page['cached']
+    assert set(page['sections']) == {'ratios', 'common_size', 'dupont', 'growth', 'dcf', 'comps'}
+    assert page['degraded'] == []
+    assert [row['ticker'] for row in page['sections']['comps']['data']] == ['AAA', 'BBB']
+    assert 'standardize' in page['timings']
+
+    again = client.post('/onepager/api', json={'ticker': 'AAA', 'peers': ['BBB']}).get_json()
+    assert again['cached']
+    changed = client.get('/onepager/api', query_string={'ticker': 'AAA', 'peers': 'BBB', 'wacc': 0.12}).get_json()
+    assert not changed['cached']
+
+
+def test_slow_comps_only_degrades_that_section(client, monkeypatch):
+    def slow_comps(tickers, **kwargs):
+        time.sleep(1.0)
+        return []
+
+    monkeypatch.setattr(onepager, 'comparables_table', slow_comps)
+    monkeypatch.setitem(client.application.config, 'ONEPAGER_COMPS_TIMEOUT', 0.2)
+    page = client.get('/onepager/api', query_string={'ticker': 'AAA'}).get_json()
+    assert page['degraded'] == ['comps']
+    assert page['sections']['dcf']['ok']
+    assert not client.get('/onepager/api', query_string={'ticker': 'AAA'}).get_json()['cached']
+
+
+def test_onepager_view_reports_missing_data(client):
+    resp = client.get('/onepager/?ticker=MISS')
+    assert resp.status_code == 200
+    assert b'Could not locate statements' in resp.data
+
+
+def test_leaked_comps_threads_do_not_delay_other_sections(client, monkeypatch):
+    def slow_comps(tickers, **kwargs):
+        time.sleep(3.0)
+        return []
+
+    monkeypatch.setattr(onepager, 'comparables_table', slow_comps)
+    monkeypatch.setitem(client.application.config, 'ONEPAGER_COMPS_TIMEOUT', 0.1)
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        pages = list(pool.map(
+            lambda i: client.application.test_client().get(
+                '/onepager/api', query_string={'ticker': 'AAA', 'wacc': 0.08 + i / 1000}
+            ).get_json(),
+            range(12),
+        ))
+    # Queued behind the sleeping comps threads, a page would take at least 3s.
+    for page in pages:
+        assert page['degraded'] == ['comps']
+        assert page['total_ms'] < 2000
+        assert page['timings']['ratios'] < 2000
+
+    page = client.get('/onepager/api', query_string={'ticker': 'AAA', 'wacc': 0.2}).get_json()
+    assert page['degraded'] == ['comps']
+    assert page['total_ms'] < 2000
+
+
+def test_onepager_view_reports_bad_parameters(client):
+    resp = client.get('/onepager/?ticker=AAA&wacc=abc')
+    assert resp.status_code == 200
+    assert b'Invalid parameter' in resp.data
+
+
+def test_pinned_pages_outlive_the_ttl(client, monkeypatch):
+    data_dir = client.application.config['DATA_DIR']
+    onepager.build_onepager('AAA', data_dir=data_dir, pin=True)
+    onepager.build_onepager('AAA', data_dir=data_dir, wacc=0.12)
+    monkeypatch.setattr(onepager, 'CACHE_TTL', -1.0)
+    assert onepager.build_onepager('AAA', data_dir=data_dir)['cached']
+    assert not onepager.build_onepager('AAA', data_dir=data_dir, wacc=0.12)['cached']
+
+
+def test_refetched_peer_invalidates_cached_page(client, fetch):
+    query = {'ticker': 'AAA', 'peers': 'BBB'}
+    fetch('BBB')
+    first = client.get('/onepager/api', query_string=query).get_json()
+    assert first['degraded'] == [] and not first['cached']
+    assert client.get('/onepager/api', query_string=query).get_json()['cached']
+
+    time.sleep(1.1)  # snapshot folders are named to the second
+    [folder] = fetch('BBB')
+    again = client.get('/onepager/api', query_string=query).get_json()
+    assert not again['cached']
+    bbb = next(row for row in again['sections']['comps']['data'] if row['ticker'] == 'BBB')
+    assert bbb['snapshot'] == folder
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+
+from loadtest import run_load_test
+from services import providers
+from services.providers import FixtureProvider, ProviderError
+
+
+def test_fixture_provider_filters_history_and_injects_errors(fixture_dir):
+    provider = FixtureProvider(str(fixture_dir))
+    hist = provider.history('aaa', start='2024-06-01')
+    assert hist.index.min() >= hist.index.max().replace(month=6, day=1)
+    assert set(['Open', 'High', 'Low', 'Close', 'Volume']) <= set(hist.columns)
+
+    failing = FixtureProvider(str(fixture_dir), error_rate=1.0, seed=1)
+    with pytest.raises(ProviderError):
+        failing.quote('AAA')
+
+
+def test_fetch_route_replays_fixtures(replay_app):
+    client = replay_app.test_client()
+    resp = client.post('/data/fetch', json={'ticker': 'AAA'})
+    assert resp.status_code == 200
+    folder = resp.get_json()['folder']
+    assert Path(folder, 'income_statement.csv').exists()
+
+    resp = client.get('/sports/live')
+    assert resp.get_json() == {'ok': True, 'data': {'results': 0, 'response': []}}
+
+
+def test_fetch_route_reports_missing_fixture(replay_app):
+    resp = replay_app.test_client().post('/data/fetch', json={'ticker': 'NOPE'})
+    assert resp.status_code == 502
+    assert resp.get_json()['ok'] is False
+
+
+def test_load_test_reports_latency_per_route(replay_app):
+    report = run_load_test(['AAA', 'BBB'], concurrency=2, iterations=4, app=replay_app)
+    fetch = report['routes']['POST /data/fetch']
+    assert fetch['count'] == 4
+    assert fetch['errors'] == 0
+    assert fetch['p50'] <= fetch['p95'] <= fetch['p99']
+    assert 'POST /valuation/dcf' in report['routes']
+
+
+def test_fetch_route_maps_empty_window_to_502(replay_app):
+    resp = replay_app.test_client().post('/data/fetch', json={'ticker': 'AAA', 'start': '2030-01-01'})
+    assert resp.status_code == 502
+    assert 'No price history' in resp.get_json()['error']
+
+
+def test_dcf_route_maps_provider_failure_to_502(replay_app, fixture_dir, monkeypatch):
+    client = replay_app.test_client()
+    assert client.post('/data/fetch', json={'ticker': 'AAA'}).status_code == 200
+    monkeypatch.setattr(providers, '_market_provider', FixtureProvider(str(fixture_dir), error_rate=1.0))
+    resp = client.post('/valuation/dcf', json={'ticker': 'AAA', 'wacc': 0.09, 'terminal_growth': 0.02, 'forecast_years': 5})
+    assert resp.status_code == 502
+    assert 'injected failure' in resp.get_json()['error']
+
+
+def test_yahoo_errors_are_wrapped(monkeypatch):
+    def boom(*args, **kwargs):
+        raise ConnectionError('network down')
+
+    monkeypatch.setattr(providers.yf, 'download', boom)
+    with pytest.raises(ProviderError, match='network down'):
+        providers.YahooProvider().history('AAA')
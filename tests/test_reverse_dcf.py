@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from services.valuation import dcf_enterprise_value, reverse_dcf, simple_dcf
+
+
+def test_reverse_dcf_recovers_growth_over_grid():
+    growths = np.linspace(-0.2, 0.4, 7)
+    waccs = np.array([[0.08], [0.10], [0.12]])
+    ev = dcf_enterprise_value(100.0, growths, waccs, 0.025, 5)
+    res = reverse_dcf(price=ev - 50.0, shares=1.0, base_fcf=100.0, net_debt=50.0, wacc=waccs, terminal_growth=0.025)
+    assert res['implied'].shape == (3, 7)
+    assert (res['status'] == 'converged').all()
+    np.testing.assert_allclose(res['implied'], np.broadcast_to(growths, (3, 7)), atol=1e-8)
+
+
+def test_reverse_dcf_recovers_wacc():
+    ev = dcf_enterprise_value(100.0, 0.05, np.array([0.07, 0.09, 0.15]), 0.02, 5)
+    res = reverse_dcf(price=ev, shares=1.0, base_fcf=100.0, net_debt=0.0, growth=0.05, terminal_growth=0.02,
+                      solve_for='wacc')
+    np.testing.assert_allclose(res['implied'], [0.07, 0.09, 0.15], atol=1e-8)
+
+
+def test_reverse_dcf_reports_failures_per_element():
+    res = reverse_dcf(price=[1e12, 100.0, 100.0], shares=1.0, base_fcf=[100.0, 100.0, 0.0], net_debt=0.0,
+                      wacc=[0.09, 0.02, 0.09], terminal_growth=0.03)
+    assert list(res['status']) == ['no_bracket', 'invalid', 'invalid']
+    assert np.isnan(res['implied']).all()
+
+
+@pytest.fixture
+def client(replay_client, fetch):
+    fetch('AAA', 'BBB')
+    return replay_client
+
+
+def test_reverse_dcf_route_inverts_simple_dcf(client):
+    dcf = simple_dcf('AAA', 0.09, 0.025, 5, data_dir=client.application.config['DATA_DIR'])
+    resp = client.post('/valuation/reverse-dcf', json={
+        'tickers': ['AAA', 'BBB', 'MISSING'],
+        'wacc': [0.09, 0.11],
+        'terminal_growth': 0.025,
+        'prices': {'AAA': dcf['price_target']},
+    })
+    assert resp.status_code == 200
+    rows = resp.get_json()['rows']
+    assert len(rows) == 5
+    aaa = next(r for r in rows if r['ticker'] == 'AAA' and r['wacc'] == 0.09)
+    assert aaa['status'] == 'converged'
+    assert aaa['implied_growth'] == pytest.approx(dcf['assumed_growth'], abs=1e-6)
+    assert rows[-1] == {'ticker': 'MISSING', 'status': 'error', 'error': rows[-1]['error']}
+    assert client.post('/valuation/reverse-dcf', json={'ticker': 'AAA', 'terminal_growth': 0.02}).status_code == 400
+
+
+def test_reverse_dcf_accepts_scalars():
+    res = reverse_dcf(price=100.0, shares=1.0, base_fcf=10.0, net_debt=0.0, wacc=0.1, terminal_growth=0.02)
+    assert res['implied'].shape == () and res['status'] == 'converged'
+    ev = dcf_enterprise_value(10.0, float(res['implied']), 0.1, 0.02, 5)
+    assert float(ev) == pytest.approx(100.0)
+
+
+@pytest.mark.parametrize('body', [
+    {'terminal_growth': 'abc', 'wacc': 0.09},
+    {'terminal_growth': 0.02, 'wacc': 'abc'},
+    {'terminal_growth': 0.02, 'wacc': 0.09, 'forecast_years': 'five'},
+    {'terminal_growth': 0.02, 'solve_for': 'wacc', 'growth': {'a': 1}},
+    {'terminal_growth': 0.02, 'wacc': 0.09, 'prices': [1]},
+    {'terminal_growth': 0.02, 'wacc': 0.09, 'prices': {'AAA': 'cheap'}},
+    {'terminal_growth': 0.02, 'wacc': 0.09, 'tickers': 5},
+])
+def test_reverse_dcf_route_rejects_bad_numbers(client, body):
+    resp = client.post('/valuation/reverse-dcf', json={'ticker': 'AAA', **body})
+    assert resp.status_code == 400
+    assert resp.get_json()['ok'] is False
+
+
+def test_reverse_dcf_route_parses_ticker_string_and_price_keys(client):
+    resp = client.post('/valuation/reverse-dcf', json={
+        'tickers': 'aaa, BBB', 'wacc': 0.09, 'terminal_growth': 0.02, 'prices': {'aaa': 123.0},
+    })
+    assert resp.status_code == 200
+    rows = resp.get_json()['rows']
+    assert [r['ticker'] for r in rows] == ['AAA', 'BBB']
+    assert rows[0]['price'] == 123.0
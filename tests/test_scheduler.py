@@ -0,0 +1,147 @@
+import datetime as dt
+import os
+import random
+import time
+
+import pytest
+
+from app import create_app
+from services import analysis, onepager, providers
+from services.providers import FixtureProvider
+from services.scheduler import RefreshScheduler, parse_window
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += dt.timedelta(**kwargs)
+
+
+@pytest.fixture
+def fixtures(fixture_dir, monkeypatch):
+    monkeypatch.setattr(providers, '_market_provider', FixtureProvider(str(fixture_dir)))
+    onepager.clear_cache()
+    analysis.clear_cache()
+    return fixture_dir
+
+
+def make_scheduler(tmp_path, clock, **kwargs):
+    return RefreshScheduler(
+        str(tmp_path / 'data'), watchlist=['aaa'], interval=3600, jitter=60, retry=60,
+        window=parse_window('01-06'), clock=clock, rng=random.Random(0), **kwargs
+    )
+
+
+def test_refreshes_due_tickers_in_window_and_skips_unchanged(tmp_path, fixtures, monkeypatch):
+    clock = FakeClock(dt.datetime(2025, 1, 6, 2, 0))
+    sched = make_scheduler(tmp_path, clock)
+    assert sched.run_pending() == []  # initial jitter not elapsed yet
+
+    clock.advance(minutes=1)
+    [row] = sched.run_pending()
+    assert row['last_result'] == 'updated'
+    assert row['last_refresh'] == '2025-01-06T02:01:00'
+    assert os.listdir(tmp_path / 'data' / 'AAA') == ['20250106_020100']
+    monkeypatch.setattr(onepager, 'CACHE_TTL', -1.0)  # every unpinned entry has outlived its TTL
+    assert onepager.build_onepager('AAA', data_dir=str(tmp_path / 'data'))['cached']
+    assert len(analysis._cache) == 1
+    tables = analysis.analysis_tables('AAA', data_dir=str(tmp_path / 'data'))
+    assert tables is next(iter(analysis._cache.values()))
+
+    clock.advance(minutes=30)
+    assert sched.run_pending() == []
+    clock.advance(minutes=32)
+    [row] = sched.run_pending()
+    assert row['last_result'] == 'unchanged'
+    assert os.listdir(tmp_path / 'data' / 'AAA') == ['20250106_020100']
+
+    clock.advance(hours=8)
+    assert not sched.in_window(clock())
+    assert sched.run_pending() == []
+
+
+def test_failures_back_off_and_are_reported(tmp_path, fixtures):
+    clock = FakeClock(dt.datetime(2025, 1, 6, 2, 0))
+    sched = make_scheduler(tmp_path, clock)
+    sched.add('MISSING')
+    clock.advance(minutes=2)
+    rows = {r['ticker']: r for r in sched.run_pending()}
+    assert rows['AAA']['last_result'] == 'updated'
+    missing = rows['MISSING']
+    assert missing['last_result'] == 'error' and missing['failures'] == 1
+    assert 'no fixture' in missing['last_error']
+    assert missing['next_due'] == '2025-01-06T02:03:00'
+
+    clock.advance(minutes=1)
+    [row] = sched.run_pending()
+    assert row['failures'] == 2 and row['next_due'] == '2025-01-06T02:05:00'
+
+
+def test_window_wraps_midnight():
+    sched = RefreshScheduler('.', window=parse_window('22-04'))
+    assert sched.in_window(dt.datetime(2025, 1, 1, 23))
+    assert sched.in_window(dt.datetime(2025, 1, 1, 3))
+    assert not sched.in_window(dt.datetime(2025, 1, 1, 12))
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.02)
+
+
+def test_requested_refresh_runs_on_the_scheduler_thread_outside_the_window(tmp_path, fixtures):
+    clock = FakeClock(dt.datetime(2025, 1, 6, 12, 0))
+    sched = make_scheduler(tmp_path, clock, tick=3600)
+    sched.start()
+    try:
+        assert sched.request_refresh(['aaa', 'nope']) == ['AAA']
+        wait_for(lambda: sched.status()[0]['last_result'] is not None)
+        assert sched.status()[0]['last_result'] == 'updated'
+    finally:
+        sched.stop(timeout=5)
+    assert not sched._thread.is_alive()
+
+
+def test_watchlist_routes(replay_client):
+    client = replay_client
+    resp = client.post('/data/watchlist', json={'add': ['aaa']})
+    assert [r['ticker'] for r in resp.get_json()['watchlist']] == ['AAA']
+    resp = client.post('/data/watchlist', json={'add': 'bbb, msft', 'remove': 'msft'})
+    assert [r['ticker'] for r in resp.get_json()['watchlist']] == ['AAA', 'BBB']
+    assert client.post('/data/watchlist', json={'add': 5}).status_code == 400
+    assert client.post('/data/watchlist', json={'remove': [1]}).status_code == 400
+
+    resp = client.post('/data/watchlist/refresh', json={'tickers': 'aaa'})
+    assert resp.status_code == 202 and resp.get_json()['queued'] == ['AAA']
+
+    def aaa():
+        return client.get('/data/watchlist').get_json()['watchlist'][0]
+    wait_for(lambda: aaa()['last_result'] is not None)
+    assert aaa()['last_result'] == 'updated' and aaa()['snapshot']
+
+
+@pytest.mark.parametrize('debug, run_main, started', [
+    (None, None, True),
+    (True, None, False),  # reloader parent: only watches files
+    (True, 'true', True),  # reloader child: serves requests
+])
+def test_create_app_starts_scheduler_once_under_reloader(tmp_path, monkeypatch, debug, run_main, started):
+    calls = []
+    monkeypatch.setattr(RefreshScheduler, 'start', lambda self: calls.append(self))
+    monkeypatch.setenv('DATA_DIR', str(tmp_path / 'data'))
+    monkeypatch.setenv('UPLOAD_DIR', str(tmp_path / 'uploads'))
+    monkeypatch.setenv('REFRESH_ENABLED', '1')
+    monkeypatch.delenv('FLASK_DEBUG', raising=False)
+    if run_main:
+        monkeypatch.setenv('WERKZEUG_RUN_MAIN', run_main)
+    else:
+        monkeypatch.delenv('WERKZEUG_RUN_MAIN', raising=False)
+    create_app(debug=debug)
+    assert len(calls) == int(started)